@@ -1,4 +1,3 @@
-import json
 import math
 import cv2
 import base64
@@ -8,19 +7,22 @@ import numpy as np
 from ultralytics.utils.plotting import colors
 from VehicleDetectionTracker.color_classifier.classifier import Classifier as ColorClassifier
 from VehicleDetectionTracker.model_classifier.classifier import Classifier as ModelClassifier
+from VehicleDetectionTracker._motion_kernel import mean_segment_speed, direction_sector
 from datetime import datetime
 
 class VehicleDetectionTracker:
 
-    def __init__(self, model_path="yolov8n.pt"):
+    def __init__(self, model_path="yolov8n.pt", half=False):
         """
         Initialize the VehicleDetection class.
 
         Args:
             model_path (str): Path to the YOLO model file.
+            half (bool): Run the detector in FP16 on CUDA devices (ignored on CPU and for TensorRT engines).
         """
         # Load the YOLO model and set up data structures for tracking.
         self.model = YOLO(model_path)
+        self.half = half
         self.track_history = defaultdict(lambda: [])  # History of vehicle tracking
         self.detected_vehicles = set()  # Set of detected vehicles
         self.color_classifier = None
@@ -34,22 +36,13 @@ class VehicleDetectionTracker:
         if self.model_classifier is None:
             self.model_classifier = ModelClassifier()
 
+    # Direction labels per 45° sector, starting at -π (image y points down)
+    DIRECTION_LABELS = ("Left", "Top Left", "Top", "Top Right",
+                        "Right", "Bottom Right", "Bottom", "Bottom Left")
+
     def _map_direction_to_label(self, direction):
-        # Define direction ranges in radians and their corresponding labels
-        direction_ranges = {
-            (-math.pi / 8, math.pi / 8): "Right",
-            (math.pi / 8, 3 * math.pi / 8): "Bottom Right",
-            (3 * math.pi / 8, 5 * math.pi / 8): "Bottom",
-            (5 * math.pi / 8, 7 * math.pi / 8): "Bottom Left",
-            (7 * math.pi / 8, -7 * math.pi / 8): "Left",
-            (-7 * math.pi / 8, -5 * math.pi / 8): "Top Left",
-            (-5 * math.pi / 8, -3 * math.pi / 8): "Top",
-            (-3 * math.pi / 8, -math.pi / 8): "Top Right"
-        }
-        for angle_range, label in direction_ranges.items():
-            if angle_range[0] <= direction <= angle_range[1]:
-                return label
-        return "Unknown"  # Return "Unknown" if the direction doesn't match any defined range
+        # Integer sector index instead of a scan over angle ranges
+        return self.DIRECTION_LABELS[direction_sector(direction)]
 
 
     def _encode_image_base64(self, image):
@@ -70,20 +63,27 @@ class VehicleDetectionTracker:
         """
         Decode a base64-encoded image.
 
+        The decoded JPEG bytes are wrapped by np.frombuffer without a copy, so
+        cv2.imdecode's output is the only frame-sized allocation.
+
         Args:
-            image_base64 (str): Base64-encoded image data.
+            image_base64 (str or bytes): Base64-encoded image data.
 
         Returns:
             numpy.ndarray or None: Decoded image as a numpy array or None if decoding fails.
         """
         try:
-            image_data = base64.b64decode(image_base64)
-            image_np = np.frombuffer(image_data, dtype=np.uint8)
-            image = cv2.imdecode(image_np, flags=cv2.IMREAD_COLOR)
-            return image
-        except Exception as e:
+            image_data = base64.b64decode(image_base64, validate=False)
+        except (ValueError, TypeError):
+            # binascii.Error (a ValueError) for corrupt data, TypeError for non-text input
             return None
         
+        image_np = np.frombuffer(image_data, dtype=np.uint8)
+        if image_np.size == 0:
+            return None
+        # imdecode returns None for data that is not a valid image
+        return cv2.imdecode(image_np, flags=cv2.IMREAD_COLOR)
+        
     def _increase_brightness(self, image, factor=1.5):
         """
         Increases the brightness of an image by multiplying its pixels by a factor.
@@ -119,38 +119,79 @@ class VehicleDetectionTracker:
                 "error": "Failed to decode the base64 image"
             }
 
-    def process_frame(self, frame, frame_timestamp):
+    def process_frame(self, frame, frame_timestamp, conf=0.25, iou=0.7, encode_base64=True):
         """
         Process a single video frame to detect and track vehicles.
 
         Args:
             frame (numpy.ndarray): Input frame for processing.
+            conf (float): Minimum detection confidence; higher values leave fewer boxes for NMS and post-processing.
+            iou (float): IoU threshold used by non-maximum suppression.
+            encode_base64 (bool): Whether to JPEG/base64 encode the annotated and original frames; callers that only display locally can skip it.
 
         Returns:
-            dict: Processed information including tracked vehicles' details, the annotated frame in base64, and the original frame in base64.
+            dict: Processed information including tracked vehicles' details, the annotated frame (as a numpy array and in base64), and the original frame in base64.
         """
         self._initialize_classifiers()
+        # Process a single video frame and return detection results, an annotated frame, and the original frame as base64.
+        results = self.model.track(self._increase_brightness(frame), persist=True, tracker="bytetrack.yaml", conf=conf, iou=iou, half=self.half)  # Perform vehicle tracking in the frame
+        return self._build_response(frame, frame_timestamp, results[0] if results else None, encode_base64)
+
+    def process_batch(self, frames, frame_timestamps, conf=0.25, iou=0.7, encode_base64=True):
+        """
+        Process several consecutive video frames with a single batched tracking call.
+
+        Args:
+            frames (list of numpy.ndarray): Input frames for processing, oldest first.
+            frame_timestamps (list of datetime): Timestamp of each frame.
+            conf (float): Minimum detection confidence; higher values leave fewer boxes for NMS and post-processing.
+            iou (float): IoU threshold used by non-maximum suppression.
+            encode_base64 (bool): Whether to JPEG/base64 encode the annotated and original frames.
+
+        Returns:
+            list of dict: One response per frame, in the same format as process_frame.
+        """
+        self._initialize_classifiers()
+        # The tracker is updated with each result in order, so IDs stay consistent across the batch
+        results = self.model.track([self._increase_brightness(frame) for frame in frames], persist=True, tracker="bytetrack.yaml", conf=conf, iou=iou, half=self.half)
+        return [
+            self._build_response(frame, frame_timestamp, result, encode_base64)
+            for frame, frame_timestamp, result in zip(frames, frame_timestamps, results)
+        ]
+
+    def _build_response(self, frame, frame_timestamp, result, encode_base64=True):
+        """
+        Turn the tracking result of one frame into a response dictionary.
+
+        Args:
+            frame (numpy.ndarray): The frame that was tracked.
+            frame_timestamp (datetime): Timestamp of the frame.
+            result (ultralytics.engine.results.Results or None): Tracking result for the frame.
+            encode_base64 (bool): Whether to fill the base64 frame fields.
+
+        Returns:
+            dict: Processed information in the format returned by process_frame.
+        """
         response = {
             "number_of_vehicles_detected": 0,  # Counter for vehicles detected in this frame
             "detected_vehicles": [],  # List of information about detected vehicles
+            "annotated_frame": None,  # Annotated frame as a numpy array, for local display without decoding
             "annotated_frame_base64": None,  # Annotated frame as a base64 encoded image
             "original_frame_base64": None  # Original frame as a base64 encoded image
         }
-        # Process a single video frame and return detection results, an annotated frame, and the original frame as base64.
-        results = self.model.track(self._increase_brightness(frame), persist=True, tracker="bytetrack.yaml")  # Perform vehicle tracking in the frame
-        if results is not None and results[0] is not None and results[0].boxes is not None and results[0].boxes.id is not None:
+        if result is not None and result.boxes is not None and result.boxes.id is not None:
             # Obtain bounding boxes (xywh format) of detected objects
-            boxes = results[0].boxes.xywh.cpu()
+            boxes = result.boxes.xywh.cpu()
             # Extract confidence scores for each detected object
-            conf_list = results[0].boxes.conf.cpu()
+            conf_list = result.boxes.conf.cpu()
             # Get unique IDs assigned to each tracked object
-            track_ids = results[0].boxes.id.int().cpu().tolist()
+            track_ids = result.boxes.id.int().cpu().tolist()
             # Obtain the class labels (e.g., 'car', 'truck') for detected objects
-            clss = results[0].boxes.cls.cpu().tolist()
+            clss = result.boxes.cls.cpu().tolist()
             # Retrieve the names of the detected objects based on class labels
-            names = results[0].names
-            # Get the annotated frame using results[0].plot() and encode it as base64
-            annotated_frame = results[0].plot()
+            names = result.names
+            # Get the annotated frame using result.plot() and encode it as base64
+            annotated_frame = result.plot()
 
             for box, track_id, cls, conf in zip(boxes, track_ids, clss, conf_list):
                 x, y, w, h = box
@@ -176,9 +217,9 @@ class VehicleDetectionTracker:
                 if track_id not in self.vehicle_timestamps:
                     self.vehicle_timestamps[track_id] = {"timestamps": [], "positions": []}  # Initialize timestamps and positions lists
 
-                # Store the timestamp for this frame
-                self.vehicle_timestamps[track_id]["timestamps"].append(frame_timestamp)
-                self.vehicle_timestamps[track_id]["positions"].append((x, y))
+                # Store the timestamp for this frame (as seconds, converted once)
+                self.vehicle_timestamps[track_id]["timestamps"].append(frame_timestamp.timestamp())
+                self.vehicle_timestamps[track_id]["positions"].append((float(x), float(y)))
                 # Calculate the speed if there are enough timestamps (at least 2)
                 timestamps = self.vehicle_timestamps[track_id]["timestamps"]
                 positions = self.vehicle_timestamps[track_id]["positions"]
@@ -187,32 +228,13 @@ class VehicleDetectionTracker:
                 direction_label = None
                 direction = None
                 if len(timestamps) >= 2:
-                    delta_t_list = []
-                    distance_list = []
-                    # Calculate time intervals (delta_t) and distances traveled between successive frames
-                    for i in range(1, len(timestamps)):
-                        t1, t2 = timestamps[i - 1], timestamps[i]
-                        delta_t = t2.timestamp() - t1.timestamp()
-                        if delta_t > 0:
-                            x1, y1 = positions[i - 1]
-                            x2, y2 = positions[i]
-                            distance = math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
-                            delta_t_list.append(delta_t)
-                            distance_list.append(distance)
-
-                    
-                    # Calculate speeds in meters per second (mps) for each frame and then average them
-                    speeds = [distance / delta_t for distance, delta_t in zip(distance_list, delta_t_list)]
-                    if len(speeds) > 0:
-                        avg_speed_mps = sum(speeds) / len(speeds)
-                    else:
-                        avg_speed_mps = None
+                    # Average the speed of each step with a positive time interval
+                    avg_speed_mps, steps = mean_segment_speed(
+                        np.asarray(timestamps, dtype=np.float64), np.asarray(positions, dtype=np.float64)
+                    )
 
                     # Convert the average speed from meters per second (mps) to kilometers per hour (kph)
-                    if avg_speed_mps is not None:
-                        speed_kph = self._convert_meters_per_second_to_kmph(avg_speed_mps)
-                    else:
-                        speed_kph = None
+                    speed_kph = self._convert_meters_per_second_to_kmph(avg_speed_mps) if steps else None
                     # Calculate the direction based on the change in position between the first and last frame
                     initial_x, initial_y = positions[0]
                     final_x, final_y = positions[-1]
@@ -235,10 +257,9 @@ class VehicleDetectionTracker:
                 # Extract the frame of the detected vehicle
                 vehicle_frame = frame[int(y - h / 2):int(y + h / 2), int(x - w / 2):int(x + w / 2)]
                 vehicle_frame_base64 = self._encode_image_base64(vehicle_frame)
+                # Kept as lists of dicts; callers serialize the whole response when needed
                 color_info = self.color_classifier.predict(vehicle_frame)
-                color_info_json = json.dumps(color_info)
                 model_info = self.model_classifier.predict(vehicle_frame)
-                model_info_json = json.dumps(model_info)
     
                  # Add vehicle information to the response
                 response["detected_vehicles"].append({
@@ -253,8 +274,8 @@ class VehicleDetectionTracker:
                     },
                     "vehicle_frame_base64": vehicle_frame_base64,
                     "vehicle_frame_timestamp": frame_timestamp, 
-                    "color_info": color_info_json,
-                    "model_info": model_info_json,
+                    "color_info": color_info,
+                    "model_info": model_info,
                     "speed_info": {
                         "kph": speed_kph, 
                         "reliability": reliability,
@@ -263,12 +284,15 @@ class VehicleDetectionTracker:
                     }
                 })
                     
-            annotated_frame_base64 = self._encode_image_base64(annotated_frame)
-            response["annotated_frame_base64"] = annotated_frame_base64
+            response["annotated_frame"] = annotated_frame
+            if encode_base64:
+                annotated_frame_base64 = self._encode_image_base64(annotated_frame)
+                response["annotated_frame_base64"] = annotated_frame_base64
 
-        # Encode the original frame as base64
-        original_frame_base64 = self._encode_image_base64(frame)
-        response["original_frame_base64"] = original_frame_base64
+        if encode_base64:
+            # Encode the original frame as base64
+            original_frame_base64 = self._encode_image_base64(frame)
+            response["original_frame_base64"] = original_frame_base64
 
         return response
 
@@ -290,11 +314,10 @@ class VehicleDetectionTracker:
                 print(f"Frame rate: {frame_rate} FPS")
                 timestamp = datetime.now()
                 response = self.process_frame(frame, timestamp)
-                if 'annotated_frame_base64' in response:
-                    annotated_frame = self._decode_image_base64(response['annotated_frame_base64'])
-                    if annotated_frame is not None:
-                        # Display the annotated frame in a window
-                        cv2.imshow("Video Detection Tracker - YOLOv8 + bytetrack", annotated_frame)
+                annotated_frame = response.get('annotated_frame')
+                if annotated_frame is not None:
+                    # Display the annotated frame in a window
+                    cv2.imshow("Video Detection Tracker - YOLOv8 + bytetrack", annotated_frame)
                 # Call the callback with the response
                 result_callback(response)
                 # Break the loop if 'q' is pressed
@@ -0,0 +1,81 @@
+"""
+Motion Kernel Module
+Speed and direction numerics for tracked vehicles.
+
+This module provides:
+- Mean per-segment speed over a track's position history
+- Compass sector classification of a heading angle
+- Numba JIT compilation when numba is installed
+- A NumPy fallback with the same results
+
+Author: Academic Research Team
+"""
+
+import math
+import numpy as np
+from typing import Tuple
+
+# Optional: JIT-compiled track numerics
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _segment_speeds(timestamps, positions):
+        """Sum and count of distance/time over consecutive samples with a positive time step."""
+        total = 0.0
+        count = 0
+        for i in range(1, timestamps.shape[0]):
+            dt = timestamps[i] - timestamps[i - 1]
+            if dt > 0:
+                dx = positions[i, 0] - positions[i - 1, 0]
+                dy = positions[i, 1] - positions[i - 1, 1]
+                total += math.sqrt(dx * dx + dy * dy) / dt
+                count += 1
+        return total, count
+
+def mean_segment_speed(timestamps: np.ndarray, positions: np.ndarray) -> Tuple[float, int]:
+    """
+    Average the speed of each step of a track.
+
+    Args:
+        timestamps: float64 array of sample times in seconds, shape (N,)
+        positions: float64 array of (x, y) positions, shape (N, 2)
+
+    Returns:
+        Tuple[float, int]: (mean speed in position units per second, number of steps used);
+        the mean is 0.0 when no step has a positive duration
+    """
+    if NUMBA_AVAILABLE:
+        total, count = _segment_speeds(timestamps, positions)
+    else:
+        dt = np.diff(timestamps)
+        steps = np.hypot(*np.diff(positions, axis=0).T)
+        valid = dt > 0
+        count = int(valid.sum())
+        total = float((steps[valid] / dt[valid]).sum())
+
+    return (total / count if count else 0.0), count
+
+def direction_sector(direction: float) -> int:
+    """
+    Bucket a heading angle into one of eight 45° sectors.
+
+    Sector 0 is centered on ±π and the index grows with the angle.
+    Shifting by π/8 centers each sector on its direction; & 7 folds the last
+    half-sector back onto sector 0.
+
+    Args:
+        direction: Angle in radians from math.atan2, in [-π, π]
+
+    Returns:
+        int: Sector index 0-7
+    """
+    return int((direction + math.pi + math.pi / 8) / (math.pi / 4)) & 7
+
+# Compile (or load from cache) at import instead of on the first tracked vehicle
+if NUMBA_AVAILABLE:
+    mean_segment_speed(np.zeros(2, dtype=np.float64), np.zeros((2, 2), dtype=np.float64))
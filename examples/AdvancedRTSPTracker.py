@@ -1,9 +1,25 @@
+import os
 import cv2
 import time
+import queue
+import threading
+from collections import deque
+from datetime import datetime
 from VehicleDetectionTracker.VehicleDetectionTracker import VehicleDetectionTracker
+from rtsp_detection import fast_probe_options
+from rtsp_detection.console_log import get_console_logger
+
+# Software-decode fallback: RTSP over TCP with a 1s socket timeout so a dead
+# camera fails each connection attempt quickly (user settings take precedence)
+os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", fast_probe_options())
+
+# Callback output goes through a bounded queue drained by a listener thread,
+# so per-detection logging never blocks the detection loop on stdout
+logger = get_console_logger(__name__, drop_when_full=True)
 
 class AdvancedRTSPTracker:
-    def __init__(self, rtsp_url, max_retries=3, retry_delay=5):
+    def __init__(self, rtsp_url, max_retries=3, retry_delay=5, use_gstreamer=True, latency=0,
+                 conf=0.35, iou=0.5, batch_size=4, batch_timeout=0.1):
         """
         Initialize the advanced RTSP tracker with connection management.
         
@@ -11,22 +27,86 @@ class AdvancedRTSPTracker:
             rtsp_url (str): RTSP stream URL
             max_retries (int): Maximum number of connection retry attempts
             retry_delay (int): Delay between retry attempts in seconds
+            use_gstreamer (bool): Decode through a hardware-accelerated GStreamer pipeline
+            latency (int): rtspsrc jitter buffer latency in milliseconds
+            conf (float): Detection confidence threshold (higher is faster on busy scenes)
+            iou (float): NMS IoU threshold
+            batch_size (int): Number of frames sent to the detector per inference call
+            batch_timeout (float): Maximum time in seconds to wait for a batch to fill
         """
         self.rtsp_url = rtsp_url
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.use_gstreamer = use_gstreamer
+        self.latency = latency
+        self.conf = conf
+        self.iou = iou
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
         self.vehicle_detection = VehicleDetectionTracker()
         
-    def test_rtsp_connection(self):
+        # Capture runs on a reader thread; only the newest frame is kept
+        self._frame_q = queue.Queue(maxsize=1)
+        self._stop = threading.Event()
+        
+        # Display runs on its own thread, which owns the OpenCV window
+        self._display_q = queue.Queue(maxsize=1)
+        
+        # Cleared by 'q', a failed reconnect or shutdown
+        self._running = False
+        
+        # Timestamps of the most recent frames for rolling FPS
+        self._frame_times = deque(maxlen=30)
+    
+    def _build_gstreamer_pipeline(self):
+        """
+        Build a GStreamer pipeline that decodes the RTSP stream with NVDEC.
+        
+        Returns:
+            str: Pipeline description for cv2.CAP_GSTREAMER
+        """
+        return (
+            f"rtspsrc location={self.rtsp_url} latency={self.latency} ! "
+            "rtph264depay ! h264parse ! nvv4l2decoder ! nvvideoconvert ! "
+            "video/x-raw,format=BGRx ! videoconvert ! video/x-raw,format=BGR ! "
+            "appsink drop=1 max-buffers=1 sync=false"
+        )
+    
+    def _open_capture(self, use_gstreamer=None):
+        """
+        Open the RTSP stream, preferring hardware decode when requested.
+        
+        Args:
+            use_gstreamer (bool): Override for the instance-level decoder choice
+            
+        Returns:
+            cv2.VideoCapture: Video capture object (may not be opened)
+        """
+        if use_gstreamer is None:
+            use_gstreamer = self.use_gstreamer
+        
+        if use_gstreamer:
+            cap = cv2.VideoCapture(self._build_gstreamer_pipeline(), cv2.CAP_GSTREAMER)
+            if cap.isOpened():
+                return cap
+            cap.release()
+            print("⚠️  GStreamer pipeline unavailable, falling back to software decode")
+        
+        return cv2.VideoCapture(self.rtsp_url)
+        
+    def test_rtsp_connection(self, use_gstreamer=None):
         """
         Test if the RTSP stream is accessible.
         
+        Args:
+            use_gstreamer (bool): Override for the instance-level decoder choice
+        
         Returns:
             bool: True if connection successful, False otherwise
         """
         print(f"Testing RTSP connection to: {self.rtsp_url}")
         
-        cap = cv2.VideoCapture(self.rtsp_url)
+        cap = self._open_capture(use_gstreamer)
         if not cap.isOpened():
             print("❌ Failed to open RTSP stream")
             return False
@@ -43,18 +123,21 @@ class AdvancedRTSPTracker:
         print(f"   Frame size: {frame.shape[1]}x{frame.shape[0]}")
         return True
     
-    def connect_with_retry(self):
+    def connect_with_retry(self, use_gstreamer=None):
         """
         Attempt to connect to RTSP stream with retry logic.
         
+        Args:
+            use_gstreamer (bool): Override for the instance-level decoder choice
+        
         Returns:
             cv2.VideoCapture or None: Video capture object if successful
         """
         for attempt in range(self.max_retries):
             print(f"Connection attempt {attempt + 1}/{self.max_retries}")
             
-            if self.test_rtsp_connection():
-                cap = cv2.VideoCapture(self.rtsp_url)
+            if self.test_rtsp_connection(use_gstreamer):
+                cap = self._open_capture(use_gstreamer)
                 if cap.isOpened():
                     return cap
             
@@ -65,6 +148,144 @@ class AdvancedRTSPTracker:
         print("❌ Failed to connect after all retry attempts")
         return None
     
+    def _put_latest(self, q, item):
+        """
+        Put an item into a 1-slot queue, discarding the stale item if present.
+        
+        Args:
+            q (queue.Queue): Queue created with maxsize=1
+            item: Item to store
+        """
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put(item)
+    
+    def _reader_loop(self, cap, stop, frame_q):
+        """
+        Read frames continuously so the decoder never falls behind detection.
+        
+        The reader owns the capture and releases it on exit, so a capture is
+        never released while a read on it is still in progress.
+        
+        Args:
+            cap (cv2.VideoCapture): Opened video capture object
+            stop (threading.Event): Set to stop this reader
+            frame_q (queue.Queue): Queue this reader hands its frames to
+        """
+        try:
+            while not stop.is_set():
+                success, frame = cap.read()
+                if not success:
+                    # None tells the consumer that the stream was lost
+                    self._put_latest(frame_q, None)
+                    return
+                self._put_latest(frame_q, (frame, datetime.now()))
+        finally:
+            cap.release()
+    
+    def _start_reader(self, cap):
+        """
+        Start a reader thread for the given capture.
+        
+        Args:
+            cap (cv2.VideoCapture): Opened video capture object
+            
+        Returns:
+            threading.Thread: The running reader thread
+        """
+        # A fresh event and queue per reader: a reader that was abandoned in a
+        # hung read must not resume, or feed frames to its successor
+        self._stop = threading.Event()
+        self._frame_q = queue.Queue(maxsize=1)
+        reader = threading.Thread(target=self._reader_loop, args=(cap, self._stop, self._frame_q), daemon=True)
+        reader.start()
+        return reader
+    
+    def _stop_reader(self, reader):
+        """
+        Signal the reader thread to stop and wait for it to exit.
+        
+        A reader still blocked in cap.read() on a hung stream is left behind;
+        it releases its capture once the read returns.
+        
+        Args:
+            reader (threading.Thread): Reader thread to stop
+        """
+        self._stop.set()
+        reader.join(timeout=self.retry_delay)
+        if reader.is_alive():
+            print("⚠️  Reader is blocked on the stream, leaving it to release its capture")
+    
+    def _collect_batch(self):
+        """
+        Gather up to batch_size frames from the reader thread.
+        
+        Waits up to batch_timeout after the first frame arrives so a partial
+        batch is flushed instead of stalling on a slow stream.
+        
+        Returns:
+            tuple: (frames, timestamps, stream_lost)
+        """
+        frames, timestamps = [], []
+        deadline = None
+        
+        while len(frames) < self.batch_size:
+            timeout = 1.0 if deadline is None else deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            
+            try:
+                item = self._frame_q.get(timeout=timeout)
+            except queue.Empty:
+                break
+            
+            if item is None:
+                return frames, timestamps, True
+            
+            frame, timestamp = item
+            frames.append(frame)
+            timestamps.append(timestamp)
+            self._frame_times.append(time.monotonic())
+            
+            if deadline is None:
+                deadline = time.monotonic() + self.batch_timeout
+        
+        return frames, timestamps, False
+    
+    def _display_loop(self):
+        """
+        Show the newest annotated frame and handle key presses.
+        
+        Runs on the display thread; 'q' stops processing, 's' saves the
+        raw frame that belongs to the annotated frame on screen.
+        """
+        last_frame = None
+        
+        while self._running:
+            try:
+                annotated_frame, frame, timestamp = self._display_q.get(timeout=0.1)
+                cv2.imshow("Vehicle Detection Tracker - RTSP Stream", annotated_frame)
+                last_frame = (frame, timestamp)
+            except queue.Empty:
+                pass
+            
+            # Handle key presses
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
+                print("🛑 Quitting...")
+                self._running = False
+            elif key == ord('s') and last_frame is not None:
+                # Save current frame
+                frame, timestamp = last_frame
+                timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S")
+                filename = f"captured_frame_{timestamp_str}.jpg"
+                cv2.imwrite(filename, frame)
+                print(f"💾 Saved frame as: {filename}")
+        
+        cv2.destroyAllWindows()
+    
     def process_stream(self, result_callback=None):
         """
         Process the RTSP stream with advanced error handling.
@@ -85,61 +306,63 @@ class AdvancedRTSPTracker:
         print("Press 'q' to quit, 's' to save current frame")
         
         frame_count = 0
-        start_time = time.time()
+        self._frame_times.clear()
+        reader = self._start_reader(cap)
+        self._running = True
+        display = threading.Thread(target=self._display_loop, daemon=True)
+        display.start()
         
         try:
-            while cap.isOpened():
-                success, frame = cap.read()
-                if not success:
-                    print("⚠️  Failed to read frame, attempting to reconnect...")
-                    cap.release()
-                    cap = self.connect_with_retry()
-                    if cap is None:
-                        break
-                    continue
-                
-                frame_count += 1
-                current_time = time.time()
+            while self._running:
+                frames, timestamps, stream_lost = self._collect_batch()
                 
-                # Calculate FPS
-                if frame_count % 30 == 0:  # Update FPS every 30 frames
-                    elapsed_time = current_time - start_time
-                    fps = frame_count / elapsed_time
-                    print(f"📊 FPS: {fps:.1f}, Frames processed: {frame_count}")
+                # Process the batch with a single inference call
+                responses = []
+                if frames:
+                    responses = self.vehicle_detection.process_batch(frames, timestamps, conf=self.conf, iou=self.iou)
                 
-                # Process frame
-                from datetime import datetime
-                timestamp = datetime.now()
-                response = self.vehicle_detection.process_frame(frame, timestamp)
-                
-                # Call callback function
-                result_callback(response)
-                
-                # Display annotated frame
-                if 'annotated_frame_base64' in response:
-                    annotated_frame = self.vehicle_detection._decode_image_base64(response['annotated_frame_base64'])
+                for frame, timestamp, response in zip(frames, timestamps, responses):
+                    frame_count += 1
+                    
+                    # Calculate FPS over the last 30 frames
+                    if frame_count % 30 == 0:  # Update FPS every 30 frames
+                        elapsed_time = self._frame_times[-1] - self._frame_times[0]
+                        fps = (len(self._frame_times) - 1) / elapsed_time if elapsed_time > 0 else 0
+                        print(f"📊 FPS: {fps:.1f}, Frames processed: {frame_count}")
+                    
+                    # Call callback function
+                    result_callback(response)
+                    
+                    # Hand the annotated frame to the display thread; frames without
+                    # detections have nothing drawn on them, so show the raw frame
+                    if not response['number_of_vehicles_detected']:
+                        self._put_latest(self._display_q, (frame, frame, timestamp))
+                        continue
+                    
+                    annotated_frame = response.get('annotated_frame')
+                    if annotated_frame is None and response.get('annotated_frame_base64'):
+                        annotated_frame = self.vehicle_detection._decode_image_base64(response['annotated_frame_base64'])
                     if annotated_frame is not None:
-                        cv2.imshow("Vehicle Detection Tracker - RTSP Stream", annotated_frame)
+                        self._put_latest(self._display_q, (annotated_frame, frame, timestamp))
                 
-                # Handle key presses
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    print("🛑 Quitting...")
-                    break
-                elif key == ord('s'):
-                    # Save current frame
-                    timestamp_str = timestamp.strftime("%Y%m%d_%H%M%S")
-                    filename = f"captured_frame_{timestamp_str}.jpg"
-                    cv2.imwrite(filename, frame)
-                    print(f"💾 Saved frame as: {filename}")
+                if stream_lost:
+                    print("⚠️  Failed to read frame, attempting to reconnect...")
+                    self._stop_reader(reader)
+                    cap = self.connect_with_retry()
+                    if cap is None:
+                        self._running = False
+                        break
+                    reader = self._start_reader(cap)
                 
         except KeyboardInterrupt:
             print("\n🛑 Interrupted by user")
         except Exception as e:
             print(f"❌ Error during processing: {e}")
         finally:
-            cap.release()
-            cv2.destroyAllWindows()
+            self._running = False
+            display.join()
+            # The reader releases the capture when it exits
+            self._stop_reader(reader)
             print("✅ Stream processing completed")
     
     def default_callback(self, result):
@@ -149,21 +372,27 @@ class AdvancedRTSPTracker:
         Args:
             result (dict): Detection results
         """
-        if result['number_of_vehicles_detected'] > 0:
-            print(f"🚗 Detected {result['number_of_vehicles_detected']} vehicle(s)")
+        # Fast path: nothing to format for empty frames
+        if not result['number_of_vehicles_detected']:
+            return
+        
+        # Build the whole report first and hand it to the logger as one record
+        lines = [f"🚗 Detected {result['number_of_vehicles_detected']} vehicle(s)"]
+        
+        for vehicle in result['detected_vehicles']:
+            vehicle_id = vehicle['vehicle_id']
+            vehicle_type = vehicle['vehicle_type']
+            confidence = vehicle['detection_confidence']
             
-            for vehicle in result['detected_vehicles']:
-                vehicle_id = vehicle['vehicle_id']
-                vehicle_type = vehicle['vehicle_type']
-                confidence = vehicle['detection_confidence']
-                
-                # Speed information
-                speed_info = vehicle['speed_info']
-                speed_text = ""
-                if speed_info['kph'] is not None:
-                    speed_text = f" | Speed: {speed_info['kph']:.1f} km/h"
-                
-                print(f"   ID: {vehicle_id} | Type: {vehicle_type} | Conf: {confidence:.3f}{speed_text}")
+            # Speed information
+            speed_info = vehicle['speed_info']
+            speed_text = ""
+            if speed_info['kph'] is not None:
+                speed_text = f" | Speed: {speed_info['kph']:.1f} km/h"
+            
+            lines.append(f"   ID: {vehicle_id} | Type: {vehicle_type} | Conf: {confidence:.3f}{speed_text}")
+        
+        logger.info("\n".join(lines))
 
 # Example usage
 if __name__ == "__main__":
@@ -180,7 +409,7 @@ if __name__ == "__main__":
         For example, save to database, send alerts, etc.
         """
         if result['number_of_vehicles_detected'] > 0:
-            print(f"🎯 {result['number_of_vehicles_detected']} vehicle(s) detected!")
+            logger.info(f"🎯 {result['number_of_vehicles_detected']} vehicle(s) detected!")
             
             # You could add your custom logic here:
             # - Save to database
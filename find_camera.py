@@ -9,19 +9,36 @@ Usage:
 Author: Academic Research Team
 """
 
-import subprocess
+import os
+import sys
+import shutil
 import socket
+import subprocess
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def ping_host(ip):
-    """Ping a host and return True if reachable."""
+from rtsp_detection.rtsp_probe import rtsp_describe, probe_host, fast_probe_options
+
+# Serialize console output from worker threads
+print_lock = threading.Lock()
+
+def fping_sweep(base_ip):
+    """Ping a whole /24 with one fping process; return alive IPs, or None without fping."""
+    if shutil.which("fping") is None:
+        return None
+    
     try:
-        result = subprocess.run(['ping', '-c', '1', '-W', '1', ip], 
-                              capture_output=True, text=True, timeout=5)
-        return result.returncode == 0
-    except:
-        return False
+        result = subprocess.run(['fping', '-a', '-r', '1', '-t', '300', '-g', f"{base_ip}.1", f"{base_ip}.254"],
+                              capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    
+    # -a prints only the alive hosts, one per line
+    return set(result.stdout.split())
 
 def test_rtsp_port(ip, port=554):
     """Test if RTSP port is open."""
@@ -44,28 +61,58 @@ def scan_network():
     reachable_hosts = []
     
     print("Scanning IP addresses...")
+    ips = []
     for i in range(1, 255):
         ip = f"{base_ip}.{i}"
         
         # Skip your own IP
-        if ip == "192.168.0.103":
-            continue
-            
-        if ping_host(ip):
-            rtsp_open = test_rtsp_port(ip, 554)
-            rtsp_alt_open = test_rtsp_port(ip, 8554)
-            
+        if ip != "192.168.0.103":
+            ips.append(ip)
+    
+    with ThreadPoolExecutor(max_workers=128) as executor:
+        alive = fping_sweep(base_ip)
+        if alive is not None:
+            alive_ips = [ip for ip in ips if ip in alive]
+        else:
+            ping_futures = {ip: executor.submit(probe_host, ip) for ip in ips}
+            alive_ips = [ip for ip, future in ping_futures.items() if future.result()]
+        
+        port_futures = {
+            ip: (executor.submit(test_rtsp_port, ip, 554), executor.submit(test_rtsp_port, ip, 8554))
+            for ip in alive_ips
+        }
+        
+        for ip, (rtsp_future, rtsp_alt_future) in port_futures.items():
             status = []
-            if rtsp_open:
+            if rtsp_future.result():
                 status.append("RTSP:554")
-            if rtsp_alt_open:
+            if rtsp_alt_future.result():
                 status.append("RTSP:8554")
             
             reachable_hosts.append((ip, status))
-            print(f"✅ {ip} - {' '.join(status) if status else 'No RTSP'}")
+            with print_lock:
+                print(f"✅ {ip} - {' '.join(status) if status else 'No RTSP'}")
     
     return reachable_hosts
 
+def probe_rtsp_url(url):
+    """Open an RTSP URL and return (url, opened, frame_shape)."""
+    # Only open a decoder for URLs the server accepts
+    if rtsp_describe(url) != 200:
+        return url, False, None
+    
+    import cv2
+    
+    cap = cv2.VideoCapture(url)
+    if not cap.isOpened():
+        return url, False, None
+    
+    # Try to read a frame
+    ret, frame = cap.read()
+    cap.release()
+    
+    return url, True, frame.shape if ret and frame is not None else None
+
 def test_rtsp_urls(hosts):
     """Test RTSP URLs for reachable hosts."""
     print("\n🔍 Testing RTSP connections...")
@@ -80,31 +127,37 @@ def test_rtsp_urls(hosts):
         "rtsp://admin:password@{ip}:554",
     ]
     
+    # Use TCP and give up after 1 second instead of OpenCV's 30 second open timeout
+    os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = fast_probe_options()
+    
     working_urls = []
     
-    for ip, ports in hosts:
-        for url_template in test_urls:
-            url = url_template.format(ip=ip)
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        futures = {
+            executor.submit(probe_rtsp_url, url_template.format(ip=ip)): url_template.format(ip=ip)
+            for ip, ports in hosts
+            for url_template in test_urls
+        }
+        
+        for future in as_completed(futures):
+            url = futures[future]
             
             try:
-                import cv2
-                cap = cv2.VideoCapture(url)
-                if cap.isOpened():
-                    # Try to read a frame
-                    ret, frame = cap.read()
-                    cap.release()
-                    
-                    if ret and frame is not None:
-                        working_urls.append(url)
-                        print(f"✅ WORKING: {url}")
-                        print(f"   Frame size: {frame.shape[1]}x{frame.shape[0]}")
-                    else:
-                        print(f"⚠️  Connected but no frames: {url}")
+                _, opened, frame_shape = future.result()
+            except Exception as e:
+                with print_lock:
+                    print(f"❌ Error: {url} - {str(e)[:50]}")
+                continue
+            
+            with print_lock:
+                if frame_shape is not None:
+                    working_urls.append(url)
+                    print(f"✅ WORKING: {url}")
+                    print(f"   Frame size: {frame_shape[1]}x{frame_shape[0]}")
+                elif opened:
+                    print(f"⚠️  Connected but no frames: {url}")
                 else:
                     print(f"❌ Failed: {url}")
-                    
-            except Exception as e:
-                print(f"❌ Error: {url} - {str(e)[:50]}")
     
     return working_urls
 
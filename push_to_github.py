@@ -9,6 +9,14 @@ Crafted by Yukthesh - Building intelligent solutions for the future
 import subprocess
 import sys
 import os
+import getpass
+
+# Optional libgit2 bindings: push in-process instead of spawning git
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
 
 def run_command(command, description):
     """Run a command and handle errors."""
@@ -22,6 +30,53 @@ def run_command(command, description):
         print(f"Error output: {e.stderr}")
         return None
 
+def push_with_pygit2(username, remote_url):
+    """Configure origin and push master in-process through libgit2."""
+    repo = pygit2.Repository(pygit2.discover_repository(os.getcwd()))
+    
+    # Add remote
+    print("🔄 Adding remote repository...")
+    try:
+        repo.remotes.create("origin", remote_url)
+        print("✅ Adding remote repository completed successfully")
+    except pygit2.AlreadyExistsError:
+        print("⚠️  Remote might already exist, continuing...")
+        repo.remotes.set_url("origin", remote_url)
+        print("✅ Updating remote URL completed successfully")
+    
+    # libgit2 does not use git's credential helpers, so authenticate with a token
+    token = os.environ.get("GITHUB_TOKEN") or getpass.getpass("GitHub personal access token: ")
+    callbacks = pygit2.RemoteCallbacks(credentials=pygit2.UserPass(username, token))
+    
+    # Push to GitHub
+    print("🔄 Pushing to GitHub...")
+    try:
+        repo.remotes["origin"].push(["refs/heads/master"], callbacks=callbacks)
+    except pygit2.GitError as e:
+        print(f"❌ Pushing to GitHub failed: {e}")
+        return False
+    print("✅ Pushing to GitHub completed successfully")
+    
+    # Track origin/master, like `git push -u`
+    try:
+        repo.branches.local["master"].upstream = repo.branches.remote["origin/master"]
+    except KeyError:
+        print("⚠️  Could not set upstream for master")
+    
+    return True
+
+def push_with_git(remote_url):
+    """Configure origin and push master with the git command line."""
+    # Add remote
+    result = run_command(f"git remote add origin {remote_url}", "Adding remote repository")
+    if not result:
+        print("⚠️  Remote might already exist, continuing...")
+        run_command("git remote set-url origin " + remote_url, "Updating remote URL")
+    
+    # Push to GitHub
+    result = run_command("git push -u origin master", "Pushing to GitHub")
+    return result is not None
+
 def main():
     """Main function to push to GitHub."""
     print("🚀 GitHub Push Helper - Crafted by Yukthesh")
@@ -50,15 +105,12 @@ def main():
         print("❌ Push cancelled by user")
         return
     
-    # Add remote
-    result = run_command(f"git remote add origin {remote_url}", "Adding remote repository")
-    if not result:
-        print("⚠️  Remote might already exist, continuing...")
-        run_command("git remote set-url origin " + remote_url, "Updating remote URL")
+    if PYGIT2_AVAILABLE:
+        pushed = push_with_pygit2(username, remote_url)
+    else:
+        pushed = push_with_git(remote_url)
     
-    # Push to GitHub
-    result = run_command("git push -u origin master", "Pushing to GitHub")
-    if result:
+    if pushed:
         print("\n🎉 Successfully pushed to GitHub!")
         print(f"📖 View your repository at: https://github.com/{username}/{repo_name}")
         print("\n🎨 Your RTSP Vehicle Detection System is now live with Yukthesh branding!")
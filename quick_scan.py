@@ -6,43 +6,68 @@ Fast scan to find camera IP addresses.
 Author: Academic Research Team
 """
 
-import subprocess
-import socket
+import os
+import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-def quick_ping(ip):
-    """Quick ping test."""
-    try:
-        result = subprocess.run(['ping', '-c', '1', '-W', '1', ip], 
-                              capture_output=True, text=True, timeout=3)
-        return result.returncode == 0
-    except:
-        return False
+# Configure OpenCV before it is imported: skip the GStreamer backend and the
+# OpenCL runtime
+os.environ['OPENCV_VIDEOIO_PRIORITY_GSTREAMER'] = '0'
+os.environ['OPENCV_OPENCL_RUNTIME'] = 'disabled'
+
+import cv2
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rtsp_detection.rtsp_probe import rtsp_describe, probe_host, ffmpeg_capture_options
 
-def test_rtsp_connection(ip, credentials):
-    """Test RTSP connection with different credentials."""
-    import cv2
+# Make FFmpeg give up on a dead RTSP URL after 0.5s over TCP; it reads the
+# options each time a capture is opened
+os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = ffmpeg_capture_options("tcp", 500000)
+
+# RTSP URL templates, most common first
+RTSP_URL_TEMPLATES = (
+    "rtsp://{credentials}@{ip}:554",
+    "rtsp://{credentials}@{ip}:8554",
+    "rtsp://{credentials}@{ip}:554/stream1",
+    "rtsp://{credentials}@{ip}:554/h264Preview_01_main",
+    "rtsp://{credentials}@{ip}:554/live",
+    "rtsp://{credentials}@{ip}:554/av0_0",
+)
+
+# Serialize console output from worker threads
+print_lock = threading.Lock()
+
+def test_rtsp_connection(url):
+    """Test an RTSP URL and return the frame shape if it delivers frames."""
+    # Only open a decoder for URLs the server accepts
+    if rtsp_describe(url) != 200:
+        return None
     
-    test_urls = [
-        f"rtsp://{credentials}@{ip}:554",
-        f"rtsp://{credentials}@{ip}:8554",
-        f"rtsp://{credentials}@{ip}:554/stream1",
-        f"rtsp://{credentials}@{ip}:554/h264Preview_01_main",
-        f"rtsp://{credentials}@{ip}:554/live",
-        f"rtsp://{credentials}@{ip}:554/av0_0",
-    ]
+    try:
+        cap = cv2.VideoCapture(url)
+        if cap.isOpened():
+            ret, frame = cap.read()
+            cap.release()
+            if ret and frame is not None:
+                return frame.shape
+    except:
+        pass
     
-    for url in test_urls:
-        try:
-            cap = cv2.VideoCapture(url)
-            if cap.isOpened():
-                ret, frame = cap.read()
-                cap.release()
-                if ret and frame is not None:
-                    return url, frame.shape
-        except:
-            continue
+    return None
+
+def find_rtsp_stream(ip, credentials_list):
+    """Try every URL template with each set of credentials until one works."""
+    # Most cameras use the first template, so exhaust credentials on it first
+    for template in RTSP_URL_TEMPLATES:
+        for creds in credentials_list:
+            url = template.format(credentials=creds, ip=ip)
+            frame_shape = test_rtsp_connection(url)
+            if frame_shape is not None:
+                return url, frame_shape
     
     return None, None
 
@@ -72,30 +97,37 @@ def main():
     
     found_cameras = []
     
+    # Quick scan of common camera IPs
+    common_ips = [1, 10, 11, 12, 20, 21, 22, 50, 51, 52, 100, 101, 102, 200, 201, 202]
+    
+    candidate_ips = []
     for base_ip in ip_ranges:
-        print(f"\n🔍 Scanning {base_ip}.x network...")
-        
-        # Quick scan of common camera IPs
-        common_ips = [1, 10, 11, 12, 20, 21, 22, 50, 51, 52, 100, 101, 102, 200, 201, 202]
-        
         for i in common_ips:
             ip = f"{base_ip}.{i}"
             
             # Skip your own IP
-            if ip == "192.168.0.103":
-                continue
-                
-            if quick_ping(ip):
-                print(f"✅ Found device at {ip}")
-                
-                # Test RTSP with different credentials
-                for creds in credentials_list:
-                    url, frame_shape = test_rtsp_connection(ip, creds)
-                    if url:
-                        found_cameras.append((ip, url, frame_shape))
-                        print(f"🎉 CAMERA FOUND: {url}")
-                        print(f"   Frame size: {frame_shape[1]}x{frame_shape[0]}")
-                        break
+            if ip != "192.168.0.103":
+                candidate_ips.append(ip)
+    
+    print(f"\n🔍 Scanning {', '.join(base_ip + '.x' for base_ip in ip_ranges)} networks...")
+    
+    with ThreadPoolExecutor(max_workers=64) as executor:
+        ping_futures = {ip: executor.submit(probe_host, ip) for ip in candidate_ips}
+        alive_ips = [ip for ip, future in ping_futures.items() if future.result()]
+        
+        for ip in alive_ips:
+            print(f"✅ Found device at {ip}")
+        
+        # Test RTSP with different credentials
+        camera_futures = {ip: executor.submit(find_rtsp_stream, ip, credentials_list) for ip in alive_ips}
+        
+        for ip, future in camera_futures.items():
+            url, frame_shape = future.result()
+            if url:
+                found_cameras.append((ip, url, frame_shape))
+                with print_lock:
+                    print(f"🎉 CAMERA FOUND: {url}")
+                    print(f"   Frame size: {frame_shape[1]}x{frame_shape[0]}")
     
     if found_cameras:
         print(f"\n🎉 Found {len(found_cameras)} camera(s)!")
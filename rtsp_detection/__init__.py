@@ -13,22 +13,37 @@ Author: Academic Research Team
 License: MIT
 """
 
-from .rtsp_manager import RTSPManager
-from .connection_tester import RTSPConnectionTester
-
-# Import simple detection pipeline (no TensorFlow dependency)
-try:
-    from .simple_detection_pipeline import SimpleDetectionPipeline, SimpleDetectionConfig
-    SIMPLE_DETECTION_AVAILABLE = True
-except ImportError:
-    SIMPLE_DETECTION_AVAILABLE = False
-
-# Import full detection pipeline (requires TensorFlow)
-try:
-    from .detection_pipeline import DetectionPipeline, DetectionConfig
-    FULL_DETECTION_AVAILABLE = True
-except ImportError:
-    FULL_DETECTION_AVAILABLE = False
+import importlib
+import importlib.util
+
+from .rtsp_probe import rtsp_describe, fast_probe_options
+
+# Capability flags are derived from installed packages without importing them
+# Simple detection pipeline (no TensorFlow dependency)
+SIMPLE_DETECTION_AVAILABLE = importlib.util.find_spec("ultralytics") is not None
+
+# Full detection pipeline (requires TensorFlow)
+FULL_DETECTION_AVAILABLE = SIMPLE_DETECTION_AVAILABLE and importlib.util.find_spec("tensorflow") is not None
+
+# Public names and the submodule that defines them; loaded on first access (PEP 562)
+# so that importing the package does not pull in OpenCV, YOLO or TensorFlow
+_LAZY_ATTRIBUTES = {
+    'RTSPManager': '.rtsp_manager',
+    'RTSPConnectionTester': '.connection_tester',
+    'SimpleDetectionPipeline': '.simple_detection_pipeline',
+    'SimpleDetectionConfig': '.simple_detection_pipeline',
+    'DetectionPipeline': '.detection_pipeline',
+    'DetectionConfig': '.detection_pipeline',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __version__ = "1.0.0"
 __author__ = "Academic Research Team"
@@ -36,6 +51,8 @@ __author__ = "Academic Research Team"
 __all__ = [
     'RTSPManager',
     'RTSPConnectionTester',
+    'rtsp_describe',
+    'fast_probe_options',
     'SIMPLE_DETECTION_AVAILABLE',
     'FULL_DETECTION_AVAILABLE'
 ]
@@ -0,0 +1,104 @@
+"""
+Stats Kernel Module
+Shared timing statistics for the RTSP connection tester and detection pipeline.
+
+This module provides:
+- A single-pass mean/variance/min/max/rate kernel (Welford's algorithm)
+- A ring-buffer frame rate over the most recent frame timestamps
+- Numba JIT compilation when numba is installed
+- A NumPy fallback with the same results
+
+Author: Academic Research Team
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Optional: JIT-compiled statistics
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _welford(values, n):
+        """Single-pass mean, variance, min, max and sum of values[:n]."""
+        mean = 0.0
+        m2 = 0.0
+        total = 0.0
+        vmin = values[0]
+        vmax = values[0]
+        for i in range(n):
+            x = values[i]
+            total += x
+            delta = x - mean
+            mean += delta / (i + 1)
+            m2 += (x - mean) * delta
+            if x < vmin:
+                vmin = x
+            if x > vmax:
+                vmax = x
+        return mean, m2 / n, vmin, vmax, total
+    
+    @njit(cache=True)
+    def _ring_rate(ring, count, t):
+        """Store t as sample number count and return the rate over the samples in the ring."""
+        size = ring.shape[0]
+        ring[count % size] = t
+        n = min(count + 1, size)
+        oldest = ring[(count + 1) % size] if count + 1 >= size else ring[0]
+        span = t - oldest
+        return (n - 1) / span if span > 0 else 0.0
+
+def rolling_stats(values: np.ndarray, n: int) -> Tuple[float, float, float, float, float]:
+    """
+    Compute timing statistics over the first n samples of a buffer.
+    
+    Args:
+        values: float64 buffer of durations in seconds
+        n: Number of valid samples
+        
+    Returns:
+        Tuple[float, float, float, float, float]: (mean, variance, min, max, rate),
+        where rate is samples per second of summed duration
+    """
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0, 0.0
+    
+    if NUMBA_AVAILABLE:
+        mean, var, vmin, vmax, total = _welford(values, n)
+    else:
+        samples = values[:n]
+        mean, var = float(samples.mean()), float(samples.var())
+        vmin, vmax, total = float(samples.min()), float(samples.max()), float(samples.sum())
+    
+    return mean, var, vmin, vmax, n / total if total > 0 else 0.0
+
+def ring_rate(ring: np.ndarray, count: int, t: float) -> float:
+    """
+    Record a frame timestamp and return the frame rate over the recent window.
+    
+    Args:
+        ring: float64 buffer of timestamps, reused across calls (e.g. 64 slots)
+        count: Number of timestamps recorded before this one
+        t: Timestamp of the new frame in seconds (e.g. time.perf_counter())
+        
+    Returns:
+        float: Frames per second over the last len(ring) frames, 0.0 until two are recorded
+    """
+    if NUMBA_AVAILABLE:
+        return _ring_rate(ring, count, t)
+    
+    size = len(ring)
+    ring[count % size] = t
+    n = min(count + 1, size)
+    oldest = ring[(count + 1) % size] if count + 1 >= size else ring[0]
+    span = t - oldest
+    return (n - 1) / span if span > 0 else 0.0
+
+# Compile (or load from cache) at import instead of on the first report
+if NUMBA_AVAILABLE:
+    rolling_stats(np.zeros(1, dtype=np.float64), 1)
+    ring_rate(np.zeros(2, dtype=np.float64), 0, 0.0)
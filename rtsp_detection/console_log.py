@@ -0,0 +1,113 @@
+"""
+Console Logging Module
+Background console output for the RTSP detection modules.
+
+This module provides:
+- Queue-backed console loggers whose stdout writes run on a listener thread
+- Plain message formatting, so output reads like print()
+- A per-message rate limit for output emitted on every frame
+- Optional dropping of records when the queue is full, instead of blocking
+- A flush helper for report boundaries
+
+Author: Academic Research Team
+"""
+
+import sys
+import time
+import queue
+import atexit
+import logging
+import logging.handlers
+from typing import Dict, Optional, Tuple
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops records that repeat the same message template within an interval.
+
+    Records are keyed by logger name and the unformatted message, so a
+    template such as "Frame %d: %d vehicle(s)" is limited as a whole while
+    different messages pass independently.
+    """
+
+    def __init__(self, interval: float = 0.2):
+        """
+        Initialize the filter.
+
+        Args:
+            interval: Minimum time in seconds between two records with the same template
+        """
+        super().__init__()
+        self.interval_ns = int(interval * 1e9)
+        self._last_emit_ns: Dict[Tuple[str, str], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, str(record.msg))
+        now = time.monotonic_ns()
+        last = self._last_emit_ns.get(key)
+        if last is not None and now - last < self.interval_ns:
+            return False
+        self._last_emit_ns[key] = now
+        return True
+
+class _ConsoleQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that either waits for room or drops the record when the queue is full."""
+
+    def __init__(self, q: queue.Queue, drop_when_full: bool = False):
+        """
+        Initialize the handler.
+
+        Args:
+            q: Queue drained by the console listener
+            drop_when_full: Drop records while the queue is full instead of waiting
+        """
+        super().__init__(q)
+        self.drop_when_full = drop_when_full
+
+    def enqueue(self, record: logging.LogRecord):
+        if not self.drop_when_full:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+# Records waiting to be written; a caller that outpaces stdout waits (or, with
+# drop_when_full, loses records) once this many are queued
+CONSOLE_QUEUE_SIZE = 1000
+
+# All console loggers share one queue drained by a single listener thread
+_console_q = queue.Queue(maxsize=CONSOLE_QUEUE_SIZE)
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter("%(message)s"))
+_listener = logging.handlers.QueueListener(_console_q, _console_handler)
+_listener.start()
+atexit.register(_listener.stop)
+
+def get_console_logger(name: str, rate_limit: Optional[float] = None,
+                       drop_when_full: bool = False) -> logging.Logger:
+    """
+    Get a logger that writes plain messages to stdout from a background thread.
+
+    Args:
+        name: Logger name
+        rate_limit: If given, drop repeats of a message template within this many seconds
+        drop_when_full: Drop messages while the queue is full, so logging never
+            blocks the caller (e.g. per-detection callbacks)
+
+    Returns:
+        logging.Logger: Configured console logger
+    """
+    console = logging.getLogger(name)
+    if not console.handlers:
+        handler = _ConsoleQueueHandler(_console_q, drop_when_full)
+        if rate_limit:
+            handler.addFilter(RateLimitFilter(rate_limit))
+        console.addHandler(handler)
+        console.setLevel(logging.INFO)
+        console.propagate = False
+    return console
+
+def flush_console():
+    """Block until every queued console message has been written."""
+    _console_q.join()
@@ -0,0 +1,171 @@
+"""
+Frame Ring Module
+Shared-memory frame hand-off to a separate viewer process.
+
+This module provides:
+- A fixed-size ring of BGR frames in multiprocessing shared memory
+- A lock-free single-writer protocol: copy into a slot, then publish its index
+- A viewer process that shows the newest frame with cv2.imshow
+- Quit-key signaling from the viewer back to the producer
+
+Author: Academic Research Team
+"""
+
+import cv2
+import time
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+# Bytes reserved in front of the frame slots for the published frame counter
+_HEADER_BYTES = 64
+
+class SharedFrameRing:
+    """
+    Ring of equally sized frames in shared memory, written by one process.
+
+    The header holds the number of frames written so far; frame n lives in
+    slot n % slots. The writer fills the next slot before storing the new
+    count (one aligned 8-byte store), so a reader that sees count n can copy
+    slot (n - 1) % slots. A reader checks the count again after copying and
+    drops the copy if the writer has since wrapped around onto that slot.
+    """
+
+    def __init__(self, shape: Tuple[int, int, int], slots: int = 4,
+                 name: Optional[str] = None):
+        """
+        Create a new ring, or attach to an existing one by name.
+
+        Args:
+            shape: (height, width, channels) of every frame
+            slots: Number of frame slots
+            name: Shared memory block to attach to; None creates a new block
+        """
+        self.shape = tuple(shape)
+        self.slots = slots
+        frame_bytes = int(np.prod(self.shape))
+        size = _HEADER_BYTES + frame_bytes * slots
+
+        self._owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self._owner, size=size)
+        self._count = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf)
+        self._frames = np.ndarray((slots,) + self.shape, dtype=np.uint8,
+                                  buffer=self.shm.buf, offset=_HEADER_BYTES)
+        if self._owner:
+            self._count[0] = 0
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block, for attaching from another process."""
+        return self.shm.name
+
+    def write(self, frame: np.ndarray):
+        """
+        Copy a frame into the next slot and publish it.
+
+        Args:
+            frame: BGR frame with the ring's shape
+        """
+        count = int(self._count[0])
+        np.copyto(self._frames[count % self.slots], frame)
+        self._count[0] = count + 1
+
+    def read_latest(self, last_count: int, out: np.ndarray) -> int:
+        """
+        Copy the newest frame if one was published after last_count.
+
+        Args:
+            last_count: Frame count returned by the previous call (0 initially)
+            out: Array with the ring's shape that receives the frame
+
+        Returns:
+            int: The new frame count, or last_count if there was no usable new frame
+        """
+        count = int(self._count[0])
+        if count == last_count:
+            return last_count
+        np.copyto(out, self._frames[(count - 1) % self.slots])
+        # The writer may have reached this slot again while it was copied
+        if int(self._count[0]) - count >= self.slots - 1:
+            return last_count
+        return count
+
+    def close(self):
+        """Detach from the shared memory, removing it if this ring created it."""
+        # Views into the buffer must go before the block can be closed
+        self._count = None
+        self._frames = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+def _viewer_loop(name: str, shape: Tuple[int, int, int], slots: int,
+                 window: str, quit_event, stop_event):
+    """Viewer process: show the newest frame from the ring until stopped or 'q' is pressed."""
+    ring = SharedFrameRing(shape, slots, name=name)
+    frame = np.empty(shape, dtype=np.uint8)
+    last_count = 0
+    try:
+        while not stop_event.is_set():
+            count = ring.read_latest(last_count, frame)
+            if count != last_count:
+                last_count = count
+                cv2.imshow(window, frame)
+            elif last_count == 0:
+                # No window yet, so waitKey would return at once
+                time.sleep(0.005)
+                continue
+            # Wait up to a few ms for input; also paces polling of the ring
+            if cv2.waitKey(5) & 0xFF == ord('q'):
+                quit_event.set()
+                break
+    finally:
+        cv2.destroyAllWindows()
+        ring.close()
+
+class FrameViewer:
+    """
+    Displays frames in a separate process, fed through a SharedFrameRing.
+
+    The producer only copies each frame into shared memory; imshow and the
+    HighGUI event loop run in the viewer process.
+    """
+
+    def __init__(self, shape: Tuple[int, int, int], window: str = "Live View", slots: int = 4):
+        """
+        Create the ring and start the viewer process.
+
+        Args:
+            shape: (height, width, channels) of the frames to show
+            window: Window title
+            slots: Number of frame slots in the ring
+        """
+        # A fresh interpreter, rather than a fork of a process holding CUDA
+        # state and worker threads; it only needs cv2 and NumPy
+        ctx = mp.get_context("spawn")
+        self.ring = SharedFrameRing(shape, slots)
+        self.quit_event = ctx.Event()
+        self._stop_event = ctx.Event()
+        self._process = ctx.Process(
+            target=_viewer_loop,
+            args=(self.ring.name, self.ring.shape, slots, window, self.quit_event, self._stop_event),
+            daemon=True
+        )
+        self._process.start()
+
+    def show(self, frame: np.ndarray):
+        """Hand a frame to the viewer process."""
+        self.ring.write(frame)
+
+    def quit_requested(self) -> bool:
+        """Return True once 'q' was pressed in the viewer window."""
+        return self.quit_event.is_set()
+
+    def close(self):
+        """Stop the viewer process and release the shared memory."""
+        self._stop_event.set()
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self.ring.close()
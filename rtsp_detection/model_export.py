@@ -0,0 +1,112 @@
+"""
+Model Export Module
+TensorRT engines for the YOLO detectors used by the detection pipelines.
+
+This module provides:
+- One-time FP16 or INT8 TensorRT export of YOLO weights, cached next to them
+- INT8 calibration from a directory of saved RTSP frames
+- Fallback to the original weights when CUDA or TensorRT is missing
+
+Author: Academic Research Team
+"""
+
+import os
+import json
+import logging
+import importlib.util
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# TensorRT export needs the tensorrt package and a CUDA device
+TENSORRT_AVAILABLE = importlib.util.find_spec("tensorrt") is not None
+
+PRECISIONS = ("fp32", "fp16", "int8")
+
+def _cuda_available() -> bool:
+    """Return True if torch sees a CUDA device (torch is installed with ultralytics)."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+def _calibration_yaml(image_dir: str, names) -> str:
+    """
+    Write a dataset description that points INT8 calibration at a directory of frames.
+
+    Calibration only needs images, so the directory serves as both splits.
+    JSON is valid YAML, which avoids a YAML writer dependency.
+
+    Args:
+        image_dir: Directory of representative frames (e.g. saved with --save-frames)
+        names: Class names of the model
+
+    Returns:
+        str: Path of the dataset file
+    """
+    if isinstance(names, dict):
+        names = [names[i] for i in sorted(names)]
+    path = os.path.join(image_dir, "calibration.yaml")
+    with open(path, 'w') as f:
+        json.dump({"path": os.path.abspath(image_dir), "train": ".", "val": ".", "names": names}, f)
+    return path
+
+def resolve_model_path(model_path: str, precision: str = "fp32", imgsz: int = 640,
+                       calibration_data: Optional[str] = None, batch: int = 1) -> str:
+    """
+    Return the model file to load for the requested precision.
+
+    A ".engine" path is returned as is. For "fp16" and "int8" the weights are
+    exported to a TensorRT engine once, at the batch size used for inference
+    (which INT8 calibration must match), and the cached engine is reused on
+    later runs. Engines for batches larger than 1 are built with a dynamic
+    batch dimension so partial batches still run. If CUDA or TensorRT is
+    unavailable, or the export fails, the original weights are returned.
+
+    Args:
+        model_path: YOLO weights (.pt) or a prebuilt TensorRT engine (.engine)
+        precision: "fp32", "fp16" or "int8"
+        imgsz: Inference size the engine is built for
+        calibration_data: INT8 only; a dataset YAML or a directory of frames
+        batch: Largest number of frames per inference call
+
+    Returns:
+        str: Path of the weights or engine to load
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}, expected one of {PRECISIONS}")
+
+    if model_path.endswith(".engine") or precision == "fp32":
+        return model_path
+
+    if not (TENSORRT_AVAILABLE and _cuda_available()):
+        logger.warning(f"TensorRT or CUDA not available, running {model_path} without an engine")
+        return model_path
+
+    suffix = f"_b{batch}" if batch > 1 else ""
+    engine_path = f"{os.path.splitext(model_path)[0]}_{precision}_{imgsz}{suffix}.engine"
+    if os.path.exists(engine_path):
+        return engine_path
+
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    export_args = {"format": "engine", "imgsz": imgsz, "batch": batch, "dynamic": batch > 1, "device": 0}
+    if precision == "int8":
+        if calibration_data and os.path.isdir(calibration_data):
+            calibration_data = _calibration_yaml(calibration_data, model.names)
+        export_args.update(int8=True, data=calibration_data)
+    else:
+        export_args["half"] = True
+
+    logger.info(f"Building {precision.upper()} TensorRT engine for {model_path} (one-time)...")
+    try:
+        exported = model.export(**export_args)
+        os.replace(exported, engine_path)
+    except Exception as e:
+        logger.warning(f"TensorRT export failed, using {model_path}: {e}")
+        return model_path
+
+    logger.info(f"TensorRT engine saved to {engine_path}")
+    return engine_path
@@ -8,20 +8,42 @@ This module provides:
 - Stream property detection
 - Connection health monitoring
 - Configurable retry logic
+- Low-latency FFmpeg and GStreamer capture settings
+- Optional NVDEC hardware decoding through cv2.cudacodec
+- A background frame grabber that keeps a small ring of the newest frames
+- Optional CPU pinning and real-time scheduling of the grabber thread (Linux)
 
 Author: Academic Research Team
 """
 
+import os
 import cv2
 import time
 import logging
-from typing import Optional, Tuple, Dict, Any
+import threading
+import numpy as np
+from collections import deque
+from typing import Optional, Tuple, Dict, Any, List
 from dataclasses import dataclass
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from .rtsp_probe import ffmpeg_capture_options
+
+# Logging is configured by the application, not on import
 logger = logging.getLogger(__name__)
 
+# FFmpeg capture options exported by the user before startup take precedence
+# over the ones built from RTSPConfig
+_USER_FFMPEG_OPTIONS = os.environ.get("OPENCV_FFMPEG_CAPTURE_OPTIONS")
+
+# FFmpeg hardware decoding is requested through capture parameters (OpenCV 4.5.2+)
+HW_ACCELERATION_AVAILABLE = hasattr(cv2, "CAP_PROP_HW_ACCELERATION")
+
+# NVDEC decoding needs an OpenCV build with the CUDA contrib modules and a GPU
+try:
+    CUDACODEC_AVAILABLE = hasattr(cv2, "cudacodec") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDACODEC_AVAILABLE = False
+
 @dataclass
 class RTSPConfig:
     """Configuration for RTSP connection."""
@@ -29,7 +51,44 @@ class RTSPConfig:
     max_retries: int = 3
     retry_delay: int = 5
     connection_timeout: int = 10
-    buffer_size: int = 1024 * 1024  # 1MB buffer
+    buffer_size: int = 1  # Frames queued inside the capture backend (CAP_PROP_BUFFERSIZE)
+    
+    # Low-latency capture settings
+    transport: str = "tcp"  # RTSP transport: "tcp" or "udp"
+    latency_ms: int = 100  # GStreamer rtspsrc jitter buffer
+    probesize: int = 32  # FFmpeg probe size in bytes (32 is the minimum)
+    analyzeduration: int = 0  # FFmpeg stream analysis time in microseconds
+    max_delay: int = 0  # FFmpeg demuxer max delay in microseconds
+    use_gstreamer: bool = False  # Capture backend: GStreamer pipeline (CAP_GSTREAMER) instead of CAP_FFMPEG
+    use_cuda_decoder: bool = False  # Decode on the GPU with NVDEC (cv2.cudacodec), falling back to CPU
+    hw_decode: bool = True  # Let FFmpeg use any available hardware decoder (CUDA, VAAPI, ...), else software
+    frame_ring_size: int = 2  # Newest decoded frames kept by the background frame grabber
+    drain_stale: bool = True  # read_frame() on a live stream skips frames buffered since the last read (see grab_latest)
+    capture_cpus: Optional[Tuple[int, ...]] = None  # Pin the frame grabber thread to these CPUs (Linux)
+    capture_rt_priority: int = 0  # SCHED_FIFO priority (1-99) for the frame grabber thread; 0 keeps the default scheduler
+
+def _tune_capture_thread(cpus: Optional[Tuple[int, ...]], rt_priority: int):
+    """
+    Pin the calling thread to CPUs and/or give it real-time priority.
+    
+    On Linux both calls act on the calling thread when given pid 0. Platforms
+    without them, and SCHED_FIFO without CAP_SYS_NICE, keep the defaults.
+    
+    Args:
+        cpus: CPUs the thread may run on, or None to leave the affinity alone
+        rt_priority: SCHED_FIFO priority, or 0 to keep the default scheduler
+    """
+    if cpus:
+        try:
+            os.sched_setaffinity(0, set(cpus))
+        except (AttributeError, OSError, ValueError) as e:
+            logger.warning(f"Could not pin capture thread to CPUs {sorted(cpus)}: {e}")
+    
+    if rt_priority > 0:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(rt_priority))
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Could not give capture thread SCHED_FIFO priority {rt_priority}: {e}")
 
 @dataclass
 class StreamProperties:
@@ -40,6 +99,122 @@ class StreamProperties:
     frame_count: int
     is_live: bool
 
+class FrameGrabber(threading.Thread):
+    """
+    Reads frames continuously on a background thread into a small ring buffer.
+    
+    The camera is read at its native rate while the consumer takes the most
+    recent frame whenever it is ready, instead of the next one queued inside
+    the decoder, so a slow consumer does not fall further and further behind
+    the live stream. Older entries are evicted as new frames arrive; each is
+    stamped with its capture time so the delay to the consumer can be
+    measured. A consumer that only keeps up with every N-th frame can set
+    skip_frames so the frames it would never see are grabbed without being
+    converted to BGR.
+    
+    Frame IDs count stream frames, skipped ones included.
+    """
+    
+    def __init__(self, rtsp_manager: "RTSPManager", ring_size: int = 2):
+        """
+        Initialize the grabber.
+        
+        Args:
+            rtsp_manager: Connected RTSP manager to read from
+            ring_size: Number of newest frames to keep
+        """
+        super().__init__(daemon=True)
+        self._manager = rtsp_manager
+        self._ring = deque(maxlen=max(1, ring_size))  # (frame ID, capture time, frame)
+        self._frame_id = 0
+        self._delivered_at: Optional[float] = None  # Capture time of the last frame handed out
+        self.skip_frames = 0  # Frames to grab without decoding before each decoded one
+        self._new_frame = threading.Condition()
+        self._stop_event = threading.Event()  # Not _stop: that would shadow Thread._stop()
+    
+    def run(self):
+        """Read frames until stopped or the stream is lost for good."""
+        config = self._manager.config
+        # Keeps the decoder's working set on the same cores and preempts
+        # ordinary threads, which steadies per-frame capture time
+        _tune_capture_thread(config.capture_cpus, config.capture_rt_priority)
+        
+        while not self._stop_event.is_set():
+            # grab_frame and read_frame handle reconnection on failure
+            skipped = 0
+            ok = True
+            for _ in range(self.skip_frames):
+                if not self._manager.grab_frame():
+                    ok = False
+                    break
+                skipped += 1
+            
+            if ok:
+                # Reading at the stream rate leaves nothing to drain
+                ok, frame = self._manager.read_frame(drain=False)
+            if not ok:
+                if not self._manager.is_connected:
+                    break
+                continue
+            
+            captured_at = time.perf_counter()
+            with self._new_frame:
+                self._frame_id += skipped + 1
+                self._ring.append((self._frame_id, captured_at, frame))
+                self._new_frame.notify_all()
+        
+        # Wake up a waiting consumer so it notices the grabber has stopped
+        with self._new_frame:
+            self._new_frame.notify_all()
+    
+    def read(self, last_frame_id: int = 0, timeout: float = 1.0) -> Tuple[bool, Optional[np.ndarray], int]:
+        """
+        Wait for a frame newer than last_frame_id and return it.
+        
+        Args:
+            last_frame_id: ID of the last frame the caller processed
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            Tuple[bool, Optional[np.ndarray], int]: (success, frame, frame ID)
+        """
+        with self._new_frame:
+            self._new_frame.wait_for(
+                lambda: self._frame_id != last_frame_id or not self.is_alive(), timeout
+            )
+            if not self._ring or self._frame_id == last_frame_id:
+                return False, None, last_frame_id
+            frame_id, captured_at, frame = self._ring[-1]
+            self._delivered_at = captured_at
+            return True, frame, frame_id
+    
+    def recent_frames(self) -> List[Tuple[int, float, np.ndarray]]:
+        """
+        Return the buffered frames, oldest first.
+        
+        Returns:
+            List[Tuple[int, float, np.ndarray]]: (frame ID, capture time, frame) per entry
+        """
+        with self._new_frame:
+            return list(self._ring)
+    
+    def get_latency(self) -> Optional[float]:
+        """
+        Return the time in seconds since the last frame handed out by read() was captured.
+        
+        Called after a frame has been processed, this is the capture-to-result delay.
+        """
+        delivered_at = self._delivered_at
+        if delivered_at is None:
+            return None
+        return time.perf_counter() - delivered_at
+    
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the grabber and wait for the current read to finish."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
 class RTSPManager:
     """
     Manages RTSP stream connections with robust error handling.
@@ -61,6 +236,8 @@ class RTSPManager:
         """
         self.config = config
         self.cap: Optional[cv2.VideoCapture] = None
+        self.gpu_reader = None  # cv2.cudacodec.VideoReader when NVDEC decoding is active
+        self.frame_grabber: Optional[FrameGrabber] = None
         self.is_connected = False
         self.connection_attempts = 0
         self.last_frame_time = 0
@@ -68,6 +245,73 @@ class RTSPManager:
         
         # Set OpenCV buffer size for RTSP
         cv2.setUseOptimized(True)
+    
+    def _ffmpeg_capture_options(self) -> str:
+        """
+        Build OPENCV_FFMPEG_CAPTURE_OPTIONS for a low-latency RTSP capture.
+        
+        FFmpeg otherwise probes and buffers the stream for seconds before
+        the first frame, which shows up as a constant lag behind real time.
+        
+        Returns:
+            str: Option string in OpenCV's "key;value|key;value" format
+        """
+        # The socket timeout option is named after the installed FFmpeg version
+        return ffmpeg_capture_options(
+            self.config.transport,
+            self.config.connection_timeout * 1000000,
+            probesize=self.config.probesize,
+            analyzeduration=self.config.analyzeduration,
+            max_delay=self.config.max_delay,
+            reorder_queue_size=0,
+            fflags="nobuffer",
+            flags="low_delay"
+        )
+    
+    def _gstreamer_pipeline(self) -> str:
+        """
+        Build a GStreamer pipeline that keeps only the newest decoded frame.
+        
+        Returns:
+            str: Pipeline string for cv2.VideoCapture
+        """
+        return (
+            f"rtspsrc location={self.config.url} latency={self.config.latency_ms} "
+            f"protocols={self.config.transport} drop-on-latency=true ! "
+            "rtph264depay ! h264parse ! avdec_h264 ! videoconvert ! video/x-raw,format=BGR ! "
+            "appsink max-buffers=1 drop=true sync=false"
+        )
+    
+    def get_capture_settings(self) -> Dict[str, Any]:
+        """
+        Describe the capture mode and latency settings in use.
+        
+        Returns:
+            Dict[str, Any]: Capture mode and its settings
+        """
+        # connect() falls back to CPU decoding when the NVDEC reader fails to open
+        if self.gpu_reader is not None:
+            return {"mode": "nvdec", "allow_frame_drop": True}
+        
+        if self.config.use_gstreamer:
+            return {
+                "mode": "gstreamer",
+                "transport": self.config.transport,
+                "latency_ms": self.config.latency_ms
+            }
+        
+        hw_acceleration = None
+        if self.cap is not None and HW_ACCELERATION_AVAILABLE:
+            hw_acceleration = int(self.cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+        
+        return {
+            "mode": "ffmpeg",
+            "hw_acceleration": hw_acceleration,  # cv2.VIDEO_ACCELERATION_* in use, 0 for software
+            "transport": self.config.transport,
+            "probesize": self.config.probesize,
+            "analyzeduration": self.config.analyzeduration,
+            "max_delay": self.config.max_delay
+        }
         
     def connect(self) -> bool:
         """
@@ -78,11 +322,30 @@ class RTSPManager:
         """
         logger.info(f"Connecting to RTSP stream: {self.config.url}")
         
+        if self.config.use_cuda_decoder:
+            if self._connect_cuda():
+                return True
+            logger.warning("NVDEC decoding unavailable, falling back to CPU decoding")
+        
         try:
-            # Create VideoCapture object
-            self.cap = cv2.VideoCapture(self.config.url)
+            # Create VideoCapture object with an explicit backend, so OpenCV
+            # does not probe other backends first
+            if self.config.use_gstreamer:
+                self.cap = cv2.VideoCapture(self._gstreamer_pipeline(), cv2.CAP_GSTREAMER)
+            else:
+                # FFmpeg only reads its options from the environment while the
+                # capture is being constructed, so they must be set first
+                os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = _USER_FFMPEG_OPTIONS or self._ffmpeg_capture_options()
+                if self.config.hw_decode and HW_ACCELERATION_AVAILABLE:
+                    # ANY picks the first working hardware decoder and falls
+                    # back to software decoding if there is none
+                    self.cap = cv2.VideoCapture(self.config.url, cv2.CAP_FFMPEG, [
+                        cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+                    ])
+                else:
+                    self.cap = cv2.VideoCapture(self.config.url, cv2.CAP_FFMPEG)
             
-            # Set buffer size
+            # Keep the backend queue short so reads return fresh frames
             self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.config.buffer_size)
             
             if not self.cap.isOpened():
@@ -112,6 +375,53 @@ class RTSPManager:
                 self.cap.release()
             return False
     
+    def _connect_cuda(self) -> bool:
+        """
+        Open the RTSP stream with an NVDEC hardware decoder.
+        
+        Returns:
+            bool: True if the GPU reader delivered a first frame, False otherwise
+        """
+        if not CUDACODEC_AVAILABLE:
+            return False
+        
+        try:
+            params = cv2.cudacodec.VideoReaderInitParams()
+            params.allowFrameDrop = True
+            params.minNumDecodeSurfaces = 1
+            params.rawMode = False
+            
+            reader = cv2.cudacodec.createVideoReader(self.config.url, params=params)
+            reader.set(cv2.cudacodec.ColorFormat_BGR)
+            
+            # Test connection by decoding a frame
+            ok, _ = reader.nextFrame()
+            if not ok:
+                logger.error("Failed to decode frame with NVDEC")
+                return False
+            
+            stream_format = reader.format()
+            self.gpu_reader = reader
+            self.stream_properties = StreamProperties(
+                width=stream_format.width,
+                height=stream_format.height,
+                fps=getattr(stream_format, "fps", 0.0),
+                frame_count=0,
+                is_live=True
+            )
+            self.is_connected = True
+            self.connection_attempts = 0
+            
+            logger.info("Successfully connected to RTSP stream (NVDEC decoding)")
+            logger.info(f"Stream properties: {self.stream_properties}")
+            
+            return True
+            
+        except cv2.error as e:
+            logger.warning(f"Error opening NVDEC reader: {e}")
+            self.gpu_reader = None
+            return False
+    
     def connect_with_retry(self) -> bool:
         """
         Attempt to connect with retry logic.
@@ -160,18 +470,37 @@ class RTSPManager:
             is_live=is_live
         )
     
-    def read_frame(self) -> Tuple[bool, Optional[cv2.Mat]]:
+    def read_frame(self, drain: Optional[bool] = None) -> Tuple[bool, Optional[cv2.Mat]]:
         """
         Read a frame from the RTSP stream.
         
+        When draining, frames that piled up in the capture backend while the
+        caller was busy are grabbed without decoding and only the newest one
+        is decoded. Only live streams are drained: a video file returns every
+        grab at once, so each frame would look stale.
+        
+        Args:
+            drain: Skip buffered frames; None uses config.drain_stale
+        
         Returns:
             Tuple[bool, Optional[cv2.Mat]]: (success, frame)
         """
-        if not self.is_connected or not self.cap:
+        if not self.is_connected or (not self.cap and self.gpu_reader is None):
             return False, None
         
+        if drain is None:
+            drain = self.config.drain_stale
+        if drain and (self.stream_properties is None or self.stream_properties.is_live):
+            if not self.grab_latest():
+                return False, None
+            return self.retrieve_frame()
+        
         try:
-            ret, frame = self.cap.read()
+            if self.gpu_reader is not None:
+                ret, gpu_frame = self.gpu_reader.nextFrame()
+                frame = gpu_frame.download() if ret else None
+            else:
+                ret, frame = self.cap.read()
             
             if not ret or frame is None:
                 logger.warning("Failed to read frame, attempting reconnection...")
@@ -186,6 +515,186 @@ class RTSPManager:
             self._handle_connection_loss()
             return False, None
     
+    def grab_frame(self) -> bool:
+        """
+        Grab the next frame from the RTSP stream without decoding it.
+        
+        Returns:
+            bool: True if a frame was grabbed, False otherwise
+        """
+        if not self.is_connected or (not self.cap and self.gpu_reader is None):
+            return False
+        
+        try:
+            reader = self.gpu_reader if self.gpu_reader is not None else self.cap
+            if not reader.grab():
+                logger.warning("Failed to grab frame, attempting reconnection...")
+                self._handle_connection_loss()
+                return False
+            
+            self.last_frame_time = time.time()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error grabbing frame: {e}")
+            self._handle_connection_loss()
+            return False
+    
+    def grab_latest(self, max_frames: int = 30, buffered_threshold: float = 0.005) -> bool:
+        """
+        Grab frames until the capture backlog is drained.
+        
+        A grab that returns almost immediately was served from a buffered
+        frame; one that has to wait for the network returned the live frame.
+        Grabbing (without decoding) until a grab waits skips every stale
+        frame that piled up while the caller was busy.
+        
+        Args:
+            max_frames: Maximum number of frames to grab in one call
+            buffered_threshold: Grab time in seconds below which a frame counts as buffered
+            
+        Returns:
+            bool: True if the newest grabbed frame is ready to retrieve, False otherwise
+        """
+        for _ in range(max_frames):
+            grab_start = time.perf_counter()
+            if not self.grab_frame():
+                return False
+            if time.perf_counter() - grab_start > buffered_threshold:
+                break
+        return True
+    
+    def retrieve_frame(self) -> Tuple[bool, Optional[cv2.Mat]]:
+        """
+        Decode the most recently grabbed frame.
+        
+        Returns:
+            Tuple[bool, Optional[cv2.Mat]]: (success, frame)
+        """
+        if not self.is_connected or (not self.cap and self.gpu_reader is None):
+            return False, None
+        
+        try:
+            if self.gpu_reader is not None:
+                ret, gpu_frame = self.gpu_reader.retrieve()
+                frame = gpu_frame.download() if ret else None
+            else:
+                ret, frame = self.cap.retrieve()
+            
+            if not ret or frame is None:
+                logger.warning("Failed to decode grabbed frame")
+                return False, None
+            
+            return True, frame
+            
+        except Exception as e:
+            logger.error(f"Error retrieving frame: {e}")
+            return False, None
+    
+    def retrieve_frame_into(self, buf: Optional[np.ndarray]) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode the most recently grabbed frame into a preallocated buffer.
+        
+        OpenCV writes into the buffer in place when its shape and type match
+        the decoded frame, so a long-running loop does not allocate a new
+        frame per iteration. If the stream size changed, a new array is
+        returned and should be kept as the buffer for the next call.
+        
+        Args:
+            buf: Preallocated BGR uint8 array, or None to allocate
+            
+        Returns:
+            Tuple[bool, Optional[np.ndarray]]: (success, array holding the frame)
+        """
+        if not self.is_connected or (not self.cap and self.gpu_reader is None):
+            return False, None
+        
+        try:
+            if self.gpu_reader is not None:
+                ret, gpu_frame = self.gpu_reader.retrieve()
+                frame = gpu_frame.download(buf) if ret else None
+            else:
+                ret, frame = self.cap.retrieve(buf)
+            
+            if not ret or frame is None:
+                logger.warning("Failed to decode grabbed frame")
+                return False, None
+            
+            return True, frame
+            
+        except Exception as e:
+            logger.error(f"Error retrieving frame: {e}")
+            return False, None
+    
+    def read_frame_gpu(self) -> Tuple[bool, Optional["cv2.cuda.GpuMat"]]:
+        """
+        Read a frame from the RTSP stream without copying it to host memory.
+        
+        Only available while NVDEC decoding is active.
+        
+        Returns:
+            Tuple[bool, Optional[cv2.cuda.GpuMat]]: (success, frame on the GPU)
+        """
+        if not self.is_connected or self.gpu_reader is None:
+            return False, None
+        
+        try:
+            ret, gpu_frame = self.gpu_reader.nextFrame()
+            
+            if not ret:
+                logger.warning("Failed to read frame, attempting reconnection...")
+                self._handle_connection_loss()
+                return False, None
+            
+            self.last_frame_time = time.time()
+            return True, gpu_frame
+            
+        except Exception as e:
+            logger.error(f"Error reading frame: {e}")
+            self._handle_connection_loss()
+            return False, None
+    
+    def start_frame_grabber(self) -> FrameGrabber:
+        """
+        Start reading frames on a background thread.
+        
+        Once started, use read_latest_frame() instead of the other read
+        methods; the grabber thread owns the capture.
+        
+        Returns:
+            FrameGrabber: The running grabber
+        """
+        if self.frame_grabber is None or not self.frame_grabber.is_alive():
+            self.frame_grabber = FrameGrabber(self, self.config.frame_ring_size)
+            self.frame_grabber.start()
+        return self.frame_grabber
+    
+    def read_latest_frame(self, last_frame_id: int = 0, timeout: float = 1.0) -> Tuple[bool, Optional[np.ndarray], int]:
+        """
+        Get the newest frame from the background grabber.
+        
+        Args:
+            last_frame_id: ID of the last frame the caller processed; waits for a newer one
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            Tuple[bool, Optional[np.ndarray], int]: (success, frame, frame ID)
+        """
+        if self.frame_grabber is None:
+            return False, None, last_frame_id
+        return self.frame_grabber.read(last_frame_id, timeout)
+    
+    def get_frame_latency(self) -> Optional[float]:
+        """
+        Get the delay since the last frame returned by read_latest_frame() was captured.
+        
+        Returns:
+            Optional[float]: Latency in seconds, or None before the first frame
+        """
+        if self.frame_grabber is None:
+            return None
+        return self.frame_grabber.get_latency()
+    
     def _handle_connection_loss(self):
         """Handle connection loss and attempt reconnection."""
         logger.info("Handling connection loss...")
@@ -194,6 +703,7 @@ class RTSPManager:
         if self.cap:
             self.cap.release()
             self.cap = None
+        self.gpu_reader = None
         
         # Attempt reconnection
         if self.connect_with_retry():
@@ -222,9 +732,15 @@ class RTSPManager:
         """Release the RTSP connection and cleanup resources."""
         logger.info("Releasing RTSP connection...")
         
+        # Let the grabber finish its current read before the capture goes away
+        if self.frame_grabber is not None:
+            self.frame_grabber.stop(timeout=self.config.connection_timeout)
+            self.frame_grabber = None
+        
         if self.cap:
             self.cap.release()
             self.cap = None
+        self.gpu_reader = None
         
         self.is_connected = False
         logger.info("RTSP connection released")
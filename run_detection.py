@@ -18,6 +18,7 @@ Author: Academic Research Team
 
 import sys
 import os
+import logging
 import argparse
 
 # Add the project root to Python path
@@ -25,6 +26,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from rtsp_detection.detection_pipeline import DetectionPipeline, DetectionConfig
 from rtsp_detection.rtsp_manager import RTSPConfig
+from rtsp_detection.console_log import get_console_logger
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -52,12 +54,87 @@ def parse_arguments():
                        help="Maximum FPS (for performance control)")
     parser.add_argument("--no-logging", action="store_true",
                        help="Disable console logging")
+    parser.add_argument("--viewer-process", action="store_true",
+                       help="Show the live window from a separate process fed through shared memory")
+    parser.add_argument("--quiet", action="store_true",
+                       help="Do not print a line per detected vehicle")
+    
+    # Detector model
+    parser.add_argument("--engine", default=None,
+                       help="Prebuilt TensorRT engine for the YOLO detector (overrides --precision)")
+    parser.add_argument("--precision", choices=["fp32", "fp16", "int8"], default="fp32",
+                       help="Detector precision; fp16/int8 build a TensorRT engine once, or run PyTorch FP16 without TensorRT")
+    parser.add_argument("--calibration-data", default=None,
+                       help="INT8 calibration frames: dataset YAML or a directory of frames saved with --save-frames")
+    parser.add_argument("--batch-size", type=int, default=None,
+                       help="Frames per detector call (default: 4 for streams, 8 for local video files)")
+    parser.add_argument("--max-batch-wait-ms", type=float, default=100.0,
+                       help="Run a partial batch once its oldest frame has waited this long (ms)")
     
     return parser.parse_args()
 
+def make_detection_callback(vehicle_log):
+    """
+    Build the example callback that logs each detected vehicle.
+    
+    Vehicle lines go through the background console logger, so the
+    detection thread never blocks on stdout.
+    
+    Args:
+        vehicle_log: Logger for the per-vehicle lines
+        
+    Returns:
+        Callable: Callback for DetectionResult objects
+    """
+    def detection_callback(detection_result):
+        """Custom callback for detection results."""
+        vehicle_count = detection_result.detection_results.get('number_of_vehicles_detected', 0)
+        
+        if vehicle_count > 0:
+            # You can add custom processing here:
+            # - Send alerts
+            # - Save to database
+            # - Trigger other systems
+            # - etc.
+            
+            # Example: Log detailed vehicle information
+            for vehicle in detection_result.detection_results.get('detected_vehicles', []):
+                vehicle_id = vehicle.get('vehicle_id', 'Unknown')
+                vehicle_type = vehicle.get('vehicle_type', 'Unknown')
+                confidence = vehicle.get('detection_confidence', 0)
+            
+                # Speed information
+                speed_info = vehicle.get('speed_info', {})
+                speed_text = ""
+                if speed_info.get('kph') is not None:
+                    speed_text = " | Speed: %.1f km/h" % speed_info['kph']
+            
+                # Color information
+                color_info = vehicle.get('color_info') or ()
+                color_text = ""
+                if color_info:
+                    color_text = " | Color: " + color_info[0]['color']
+            
+                # Model information
+                model_info = vehicle.get('model_info') or ()
+                model_text = ""
+                if model_info:
+                    model_text = " | Model: %s %s" % (model_info[0]['make'], model_info[0]['model'])
+            
+                vehicle_log.info("🚗 Vehicle %s: %s | Conf: %.3f%s%s%s", vehicle_id, vehicle_type,
+                                 confidence, speed_text, color_text, model_text)
+    
+    return detection_callback
+
 def main():
     """Main function for vehicle detection pipeline."""
     args = parse_arguments()
+    logging.basicConfig(level=logging.WARNING if args.no_logging else logging.INFO)
+    
+    # Live streams favour latency; a local video file is read frame by frame
+    # (nothing is skipped), so larger batches raise its throughput
+    if args.batch_size is None:
+        args.batch_size = 8 if os.path.isfile(args.rtsp_url) else 4
     
     print("🚗 RTSP Vehicle Detection System")
     print("=" * 50)
@@ -67,6 +144,8 @@ def main():
     print(f"Save Detections: {'Yes' if args.save_detections else 'No'}")
     print(f"Save Frames: {'Yes' if args.save_frames else 'No'}")
     print(f"Max FPS: {args.max_fps if args.max_fps else 'Unlimited'}")
+    print(f"Detector: {args.engine if args.engine else args.precision.upper()}")
+    print(f"Batch Size: {args.batch_size}")
     print("=" * 50)
     
     # RTSP configuration
@@ -83,50 +162,23 @@ def main():
         save_frames=args.save_frames,
         log_results=not args.no_logging,
         output_dir=args.output_dir,
-        max_fps=args.max_fps
+        max_fps=args.max_fps,
+        model_path=args.engine or "yolov8n.pt",
+        precision=args.precision,
+        calibration_data=args.calibration_data,
+        batch_size=args.batch_size,
+        max_batch_wait_ms=args.max_batch_wait_ms,
+        viewer_process=args.viewer_process
     )
     
     # Create pipeline
     pipeline = DetectionPipeline(rtsp_config, detection_config)
     
-    # Custom callback function for additional processing
-    def detection_callback(detection_result):
-        """Custom callback for detection results."""
-        vehicle_count = detection_result.detection_results.get('number_of_vehicles_detected', 0)
-        
-        if vehicle_count > 0:
-            # You can add custom processing here:
-            # - Send alerts
-            # - Save to database
-            # - Trigger other systems
-            # - etc.
-            
-            # Example: Log detailed vehicle information
-            for vehicle in detection_result.detection_results.get('detected_vehicles', []):
-                vehicle_id = vehicle.get('vehicle_id', 'Unknown')
-                vehicle_type = vehicle.get('vehicle_type', 'Unknown')
-                confidence = vehicle.get('detection_confidence', 0)
-                
-                # Speed information
-                speed_info = vehicle.get('speed_info', {})
-                speed_text = ""
-                if speed_info.get('kph') is not None:
-                    speed_text = f" | Speed: {speed_info['kph']:.1f} km/h"
-                
-                # Color information
-                import json
-                color_info = json.loads(vehicle.get('color_info', '[]'))
-                color_text = ""
-                if color_info:
-                    color_text = f" | Color: {color_info[0]['color']}"
-                
-                # Model information
-                model_info = json.loads(vehicle.get('model_info', '[]'))
-                model_text = ""
-                if model_info:
-                    model_text = f" | Model: {model_info[0]['make']} {model_info[0]['model']}"
-                
-                print(f"🚗 Vehicle {vehicle_id}: {vehicle_type} | Conf: {confidence:.3f}{speed_text}{color_text}{model_text}")
+    # The example callback only logs, so none is installed when its output
+    # is disabled and the pipeline skips the per-frame call entirely
+    detection_callback = None
+    if not (args.no_logging or args.quiet):
+        detection_callback = make_detection_callback(get_console_logger("run_detection.vehicles"))
     
     # Start detection
     try:
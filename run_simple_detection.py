@@ -19,6 +19,7 @@ Crafted by Yukthesh - Building intelligent solutions for the future
 
 import sys
 import os
+import logging
 import argparse
 
 # Add the project root to Python path
@@ -26,6 +27,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from rtsp_detection.simple_detection_pipeline import SimpleDetectionPipeline, SimpleDetectionConfig
 from rtsp_detection.rtsp_manager import RTSPConfig
+from rtsp_detection.console_log import get_console_logger
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -53,14 +55,63 @@ def parse_arguments():
                        help="Maximum FPS (for performance control)")
     parser.add_argument("--no-logging", action="store_true",
                        help="Disable console logging")
+    parser.add_argument("--quiet", action="store_true",
+                       help="Do not print a line per detected vehicle")
     parser.add_argument("--confidence", type=float, default=0.5,
                        help="Detection confidence threshold (0.0-1.0)")
     
     return parser.parse_args()
 
+def make_detection_callback(vehicle_log):
+    """
+    Build the example callback that logs each detected vehicle.
+    
+    Vehicle lines go through the background console logger, so the
+    detection thread never blocks on stdout.
+    
+    Args:
+        vehicle_log: Logger for the per-vehicle lines
+        
+    Returns:
+        Callable: Callback for DetectionResult objects
+    """
+    def detection_callback(detection_result):
+        """Custom callback for detection results."""
+        vehicle_count = detection_result.detection_results.get('number_of_vehicles_detected', 0)
+        
+        if vehicle_count > 0:
+            # You can add custom processing here:
+            # - Send alerts
+            # - Save to database
+            # - Trigger other systems
+            # - etc.
+            
+            # Example: Log detailed vehicle information
+            for vehicle in detection_result.detection_results.get('detected_vehicles', []):
+                vehicle_id = vehicle.get('vehicle_id', 'Unknown')
+                vehicle_type = vehicle.get('vehicle_type', 'Unknown')
+                confidence = vehicle.get('detection_confidence', 0)
+            
+                # Speed information
+                speed_info = vehicle.get('speed_info', {})
+                speed_text = ""
+                if speed_info.get('kph') is not None:
+                    speed_text = " | Speed: %.1f km/h" % speed_info['kph']
+            
+                # Direction information
+                direction_text = ""
+                if speed_info.get('direction_label'):
+                    direction_text = " | Direction: " + speed_info['direction_label']
+            
+                vehicle_log.info("🚗 Vehicle %s: %s | Conf: %.3f%s%s", vehicle_id, vehicle_type,
+                                 confidence, speed_text, direction_text)
+    
+    return detection_callback
+
 def main():
     """Main function for simple vehicle detection pipeline."""
     args = parse_arguments()
+    logging.basicConfig(level=logging.WARNING if args.no_logging else logging.INFO)
     
     print("🚗 Simple RTSP Vehicle Detection System")
     print("=" * 50)
@@ -94,36 +145,11 @@ def main():
     # Create pipeline
     pipeline = SimpleDetectionPipeline(rtsp_config, detection_config)
     
-    # Custom callback function for additional processing
-    def detection_callback(detection_result):
-        """Custom callback for detection results."""
-        vehicle_count = detection_result.detection_results.get('number_of_vehicles_detected', 0)
-        
-        if vehicle_count > 0:
-            # You can add custom processing here:
-            # - Send alerts
-            # - Save to database
-            # - Trigger other systems
-            # - etc.
-            
-            # Example: Log detailed vehicle information
-            for vehicle in detection_result.detection_results.get('detected_vehicles', []):
-                vehicle_id = vehicle.get('vehicle_id', 'Unknown')
-                vehicle_type = vehicle.get('vehicle_type', 'Unknown')
-                confidence = vehicle.get('detection_confidence', 0)
-                
-                # Speed information
-                speed_info = vehicle.get('speed_info', {})
-                speed_text = ""
-                if speed_info.get('kph') is not None:
-                    speed_text = f" | Speed: {speed_info['kph']:.1f} km/h"
-                
-                # Direction information
-                direction_text = ""
-                if speed_info.get('direction_label'):
-                    direction_text = f" | Direction: {speed_info['direction_label']}"
-                
-                print(f"🚗 Vehicle {vehicle_id}: {vehicle_type} | Conf: {confidence:.3f}{speed_text}{direction_text}")
+    # The example callback only logs, so none is installed when its output
+    # is disabled and the pipeline skips the per-frame call entirely
+    detection_callback = None
+    if not (args.no_logging or args.quiet):
+        detection_callback = make_detection_callback(get_console_logger("run_simple_detection.vehicles"))
     
     # Start detection
     try:
@@ -9,6 +9,7 @@ This script helps install dependencies and configure the system.
 import subprocess
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 def check_python_version():
     """Check if Python version is compatible."""
@@ -30,17 +31,23 @@ def install_dependencies():
         "dataclasses;python_version<'3.7'"
     ]
     
-    for dep in dependencies:
-        print(f"Installing {dep}...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", dep])
-            print(f"✅ {dep} installed successfully")
-        except subprocess.CalledProcessError:
-            print(f"❌ Failed to install {dep}")
-            return False
+    # One pip run resolves the whole set at once instead of once per package
+    print(f"Installing {', '.join(dependencies)}...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install",
+                               "--prefer-binary", "--no-input", "-q", *dependencies])
+        print("✅ Dependencies installed successfully")
+    except subprocess.CalledProcessError:
+        print("❌ Failed to install dependencies")
+        return False
     
     return True
 
+def _probe(module_name):
+    """Import a module in a worker process (module level so it can be pickled)."""
+    __import__(module_name)
+    return True
+
 def test_imports():
     """Test if all required modules can be imported."""
     print("🔍 Testing imports...")
@@ -52,15 +59,22 @@ def test_imports():
         ("tensorflow", "TensorFlow")
     ]
     
-    for module_name, display_name in modules:
-        try:
-            __import__(module_name)
-            print(f"✅ {display_name} imported successfully")
-        except ImportError as e:
-            print(f"❌ Failed to import {display_name}: {e}")
-            return False
-    
-    return True
+    # Each module is imported in its own fresh interpreter, all at once, so
+    # the check takes as long as the slowest import rather than their sum and
+    # setup does not keep TensorFlow loaded afterwards
+    success = True
+    with ProcessPoolExecutor(max_workers=len(modules)) as executor:
+        futures = [(executor.submit(_probe, module_name), display_name)
+                   for module_name, display_name in modules]
+        for future, display_name in futures:
+            try:
+                future.result()
+                print(f"✅ {display_name} imported successfully")
+            except Exception as e:
+                print(f"❌ Failed to import {display_name}: {e}")
+                success = False
+    
+    return success
 
 def create_directories():
     """Create necessary directories."""
@@ -7,6 +7,7 @@ This script helps you configure and test your RTSP camera integration.
 import os
 import sys
 import subprocess
+import importlib.util
 
 def check_dependencies():
     """Check if required dependencies are installed."""
@@ -21,18 +22,30 @@ def check_dependencies():
     
     missing_packages = []
     
+    # Locate the packages without importing them (importing tensorflow alone takes seconds)
     for package_name, import_name in required_packages:
-        try:
-            __import__(import_name)
+        if importlib.util.find_spec(import_name) is not None:
             print(f"✅ {package_name}")
-        except ImportError:
+        else:
             print(f"❌ {package_name} - Missing")
             missing_packages.append(package_name)
     
     if missing_packages:
         print(f"\n📦 Missing packages: {', '.join(missing_packages)}")
-        print("Install them with: pip3 install " + " ".join(missing_packages))
-        return False
+        install = input("Install them now? (Y/n): ").strip().lower()
+        if install == 'n':
+            print("Install them with: pip3 install " + " ".join(missing_packages))
+            return False
+        
+        # A single pip run for all missing packages
+        try:
+            subprocess.check_call([sys.executable, "-m", "pip", "install",
+                                   "--prefer-binary", "--no-input", "-q", *missing_packages])
+        except subprocess.CalledProcessError:
+            print("❌ Failed to install: " + " ".join(missing_packages))
+            return False
+        print("✅ Missing packages installed!")
+        return True
     
     print("✅ All dependencies are installed!")
     return True
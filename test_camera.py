@@ -9,17 +9,102 @@ Usage:
 Author: Academic Research Team
 """
 
+import os
 import cv2
 import sys
 import time
+import queue
+import threading
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rtsp_detection.overlay import CachedTextOverlay
+
+# Frames buffered between pipeline stages; a full queue blocks the stage
+# before it, so a slow stage throttles the ones feeding it
+PREFETCH = 4
+
+# Overlay strip (height, width) and line origins; the text is re-rendered
+# at most every OVERLAY_REFRESH seconds and copied onto each frame
+OVERLAY_SIZE = (130, 320)
+OVERLAY_ORIGINS = [(10, 30), (10, 70), (10, 110)]
+OVERLAY_REFRESH = 0.5
+
+# cv2.pollKey (OpenCV 4.5+) handles window events without waitKey's 1 ms sleep
+_poll_key = getattr(cv2, "pollKey", None) or (lambda: cv2.waitKey(1))
+
+def _put(q, item, stop_event):
+    """Put an item on a bounded queue, giving up once the pipeline is stopping."""
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def _read_frames(cap, read_q, stop_event):
+    """Reader stage: decode frames into read_q, then send the None sentinel."""
+    while not stop_event.is_set():
+        ret, frame = cap.read()
+        if not ret or frame is None:
+            print("❌ Failed to read frame from stream")
+            break
+        if not _put(read_q, frame, stop_event):
+            break
+    _put(read_q, None, stop_event)
+
+def _annotate_frames(read_q, write_q, stop_event, stats, width, height):
+    """Compute stage: copy the cached overlay onto each frame; the FPS counter lives only here."""
+    start_time = time.time()
+    frame_count = 0
+    overlay = CachedTextOverlay(OVERLAY_SIZE, OVERLAY_ORIGINS, font_scale=1,
+                                refresh_interval=OVERLAY_REFRESH)
+    size_text = f"Size: {width}x{height}"
+    while not stop_event.is_set():
+        try:
+            frame = read_q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if frame is None:
+            break
+        
+        frame_count += 1
+        stats["frames"] = frame_count
+        
+        # Calculate FPS and redraw the text only when the overlay is due
+        if overlay.needs_refresh():
+            elapsed_time = time.time() - start_time
+            current_fps = frame_count / elapsed_time if elapsed_time > 0 else 0
+            overlay.update((f"FPS: {current_fps:.1f}", f"Frames: {frame_count}", size_text))
+        
+        # Add the cached text to the frame
+        overlay.draw(frame)
+        
+        if not _put(write_q, frame, stop_event):
+            break
+    _put(write_q, None, stop_event)
 
 def test_rtsp_stream(rtsp_url):
     """Test RTSP stream and display video."""
     print(f"🔍 Testing RTSP stream: {rtsp_url}")
     print("=" * 60)
     
-    # Try to open the stream
-    cap = cv2.VideoCapture(rtsp_url)
+    # RTSP over TCP avoids the smearing caused by lost UDP packets; options
+    # exported before startup take precedence
+    os.environ.setdefault("OPENCV_FFMPEG_CAPTURE_OPTIONS", "rtsp_transport;tcp")
+    
+    # Try to open the stream with FFmpeg, using a hardware decoder if one is
+    # available (OpenCV 4.5.2+ falls back to software decoding otherwise)
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG,
+                               [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    else:
+        cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG)
+    
+    # Keep only one frame queued in the backend so the display stays live
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     
     if not cap.isOpened():
         print("❌ Failed to open RTSP stream!")
@@ -40,48 +125,61 @@ def test_rtsp_stream(rtsp_url):
     
     print(f"📐 Frame size: {width}x{height}")
     print(f"🎬 FPS: {fps}")
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        hw = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+        print(f"⚡ Hardware decoding: {'enabled' if hw else 'not available (software decoding)'}")
     print(f"\n📹 Displaying video stream...")
     print("Press 'q' to quit")
     
-    frame_count = 0
+    # Reading, annotating and displaying run as three overlapping stages:
+    # reader thread -> read_q -> annotate thread -> write_q -> display (main
+    # thread, since HighGUI windows are not thread-safe on every platform)
+    read_q = queue.Queue(maxsize=PREFETCH)
+    write_q = queue.Queue(maxsize=PREFETCH)
+    stop_event = threading.Event()
+    stats = {"frames": 0}
+    
+    reader = threading.Thread(target=_read_frames, args=(cap, read_q, stop_event), daemon=True)
+    annotator = threading.Thread(
+        target=_annotate_frames, args=(read_q, write_q, stop_event, stats, width, height), daemon=True
+    )
+    
     start_time = time.time()
+    reader.start()
+    annotator.start()
     
     try:
         while True:
-            ret, frame = cap.read()
+            try:
+                frame = write_q.get(timeout=0.1)
+            except queue.Empty:
+                # Keep the window responsive while waiting for frames
+                if _poll_key() & 0xFF == ord('q'):
+                    break
+                continue
             
-            if not ret or frame is None:
-                print("❌ Failed to read frame from stream")
+            if frame is None:
                 break
             
-            frame_count += 1
-            
-            # Calculate FPS
-            elapsed_time = time.time() - start_time
-            current_fps = frame_count / elapsed_time if elapsed_time > 0 else 0
-            
-            # Add FPS text to frame
-            cv2.putText(frame, f"FPS: {current_fps:.1f}", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            cv2.putText(frame, f"Frames: {frame_count}", (10, 70), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            cv2.putText(frame, f"Size: {width}x{height}", (10, 110), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            
             # Display the frame
             cv2.imshow("RTSP Stream Test", frame)
             
             # Check for 'q' key to quit
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            if _poll_key() & 0xFF == ord('q'):
                 break
                 
     except KeyboardInterrupt:
         print("\n🛑 Interrupted by user")
     
     finally:
+        stop_event.set()
+        reader.join(timeout=2.0)
+        annotator.join(timeout=2.0)
         cap.release()
         cv2.destroyAllWindows()
     
+    frame_count = stats["frames"]
+    
     # Calculate final statistics
     total_time = time.time() - start_time
     avg_fps = frame_count / total_time if total_time > 0 else 0
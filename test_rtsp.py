@@ -11,6 +11,7 @@ Author: Academic Research Team
 
 import sys
 import os
+import logging
 
 # Add the project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,6 +20,8 @@ from rtsp_detection.connection_tester import RTSPConnectionTester
 
 def main():
     """Main function for RTSP connection testing."""
+    logging.basicConfig(level=logging.INFO)
+    
     print("🔍 RTSP Connection Test")
     print("=" * 50)
     
@@ -4,8 +4,103 @@ Simple RTSP connection test script.
 Use this to verify your IP camera connection before running the full vehicle detection system.
 """
 
+import os
+import sys
 import cv2
 import time
+import threading
+import numpy as np
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rtsp_detection.overlay import CachedTextOverlay
+from rtsp_detection._stats_kernel import ring_rate
+from rtsp_detection.console_log import get_console_logger, flush_console
+
+# Messages from the capture and display loops are written by a background
+# thread, at most one per template every 200 ms
+console = get_console_logger("test_rtsp_connection", rate_limit=0.2)
+
+# Low-latency FFmpeg capture: TCP transport, no input buffering or packet
+# reordering. Must be set before the capture is opened; options exported
+# before startup take precedence
+os.environ.setdefault(
+    "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+    "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|max_delay;0|reorder_queue_size;0"
+)
+
+# FPS overlay strip (height, width); the text is rasterized at most every
+# OVERLAY_REFRESH seconds and copied onto each displayed frame
+OVERLAY_SIZE = (45, 240)
+OVERLAY_REFRESH = 0.5
+
+# Frames are shown (and polled for 'q') at about this rate, whatever the camera delivers
+TARGET_DISPLAY_FPS = 30
+
+# The displayed FPS covers the last FPS_WINDOW grabbed frames
+FPS_WINDOW = 64
+
+def _capture_params():
+    """
+    Build the open-time parameters for cv2.VideoCapture.
+    
+    The decoder thread count (OpenCV 4.6+) and the hardware decoder (4.5.2+)
+    can only be chosen when opening; older builds use FFmpeg's defaults.
+    VIDEO_ACCELERATION_ANY picks the first working hardware decoder (VAAPI,
+    CUDA, D3D11, ...) and falls back to software decoding if there is none.
+    
+    Returns:
+        list: Flat list of property/value pairs
+    """
+    params = []
+    if hasattr(cv2, "CAP_PROP_N_THREADS"):
+        params += [cv2.CAP_PROP_N_THREADS, max(4, os.cpu_count() or 4)]
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        params += [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+    return params
+
+def _grab_frames(cap, frame_wanted, frame_ready, slot, display_every, stop_event, stats):
+    """
+    Capture thread: grab every frame so none back up in the stream buffer.
+    
+    Only this thread touches the capture. A grabbed frame is retrieved
+    (converted) only when the display loop has asked for one and at least
+    display_every frames have passed, so skipped frames are never converted
+    and the display never waits on a blocking grab.
+    
+    Args:
+        cap: Open cv2.VideoCapture
+        frame_wanted: Event the display loop sets when it is ready for the next frame
+        frame_ready: Event set once a requested frame is in the slot
+        slot: Dictionary whose "frame" entry receives the retrieved frame
+        display_every: Minimum number of grabbed frames between two retrieved ones
+        stop_event: Event that stops the thread
+        stats: Dictionary receiving the "grabbed" count, the current "fps" and a "failed" flag
+    """
+    timestamps = np.zeros(FPS_WINDOW, dtype=np.float64)
+    last_retrieved = -display_every
+    # The display loop is done with the previous frame when it asks for the
+    # next one, so every frame is decoded into the same buffer
+    frame_buf = None
+    while not stop_event.is_set():
+        if not cap.grab():
+            stats["failed"] = True
+            stop_event.set()
+            break
+        stats["fps"] = ring_rate(timestamps, stats["grabbed"], time.perf_counter())
+        stats["grabbed"] += 1
+        
+        if frame_wanted.is_set() and stats["grabbed"] - last_retrieved >= display_every:
+            ok, frame = cap.retrieve(frame_buf)
+            if not ok or frame is None:
+                stats["failed"] = True
+                stop_event.set()
+                break
+            frame_buf = slot["frame"] = frame
+            last_retrieved = stats["grabbed"]
+            frame_wanted.clear()
+            frame_ready.set()
 
 def test_rtsp_connection(rtsp_url, timeout=10):
     """
@@ -18,8 +113,10 @@ def test_rtsp_connection(rtsp_url, timeout=10):
     print(f"🔍 Testing RTSP connection to: {rtsp_url}")
     print("=" * 60)
     
-    # Open the RTSP stream
-    cap = cv2.VideoCapture(rtsp_url)
+    # Open the RTSP stream with FFmpeg (not a GStreamer fallback) and keep
+    # only one frame queued in the backend
+    cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG, _capture_params())
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     
     if not cap.isOpened():
         print("❌ Failed to open RTSP stream!")
@@ -42,53 +139,112 @@ def test_rtsp_connection(rtsp_url, timeout=10):
     print(f"📐 Frame size: {width}x{height}")
     print(f"🎬 FPS: {fps}")
     print(f"📊 Total frames: {frame_count if frame_count > 0 else 'Live stream'}")
+    if hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        hw_acceleration = int(cap.get(cv2.CAP_PROP_HW_ACCELERATION))
+        print(f"🖥️  Decoding: {f'hardware (VIDEO_ACCELERATION {hw_acceleration})' if hw_acceleration else 'software'}")
+    
+    # Show the decoder's Y (luma) plane as grayscale instead of converting
+    # every frame to BGR. CONVERT_RGB must be off before the first read:
+    # switching it on a capture that has delivered frames breaks retrieve().
+    # OpenCV's FFmpeg backend then returns the HxW Y plane; a backend that
+    # returns planar I420 has the Y plane in its first H rows, and one that
+    # ignores the setting keeps returning BGR
+    cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+    ok, probe = cap.read()
+    y_plane = ok and probe.ndim == 2 and probe.shape[1] == width and probe.shape[0] >= height
+    if ok and probe.ndim == 2 and not y_plane:
+        # Not an image (e.g. undecoded packets): start over with a capture
+        # that keeps the BGR conversion
+        cap.release()
+        cap = cv2.VideoCapture(rtsp_url, cv2.CAP_FFMPEG, _capture_params())
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    print(f"🎨 Display: {'grayscale (Y plane, no color conversion)' if y_plane else 'color (BGR)'}")
     
     # Try to read frames for a few seconds
     print(f"\n📹 Testing frame capture for {timeout} seconds...")
     print("Press 'q' to quit early")
     
-    frame_count = 0
+    # Capture runs on its own thread so network/decoder and GUI latency do
+    # not stall each other; the display asks for a frame when it is ready and
+    # gets the next one grabbed after that, handed over through a slot
+    display_every = max(1, round(fps / TARGET_DISPLAY_FPS)) if fps > 0 else 1
+    frame_wanted = threading.Event()
+    frame_ready = threading.Event()
+    stop_event = threading.Event()
+    slot = {"frame": None}
+    stats = {"grabbed": 0, "fps": 0.0, "failed": False}
+    grabber = threading.Thread(
+        target=_grab_frames,
+        args=(cap, frame_wanted, frame_ready, slot, display_every, stop_event, stats),
+        daemon=True
+    )
+    
+    overlay = CachedTextOverlay(OVERLAY_SIZE, [(10, 30)], font_scale=1,
+                                refresh_interval=OVERLAY_REFRESH)
+    displayed_count = 0
+    
+    # Methods called every frame are bound once
+    imshow = cv2.imshow
+    quit_key = ord('q')
+    
     start_time = time.time()
+    deadline = start_time + timeout
+    frame_wanted.set()
+    grabber.start()
     
     try:
-        while time.time() - start_time < timeout:
-            ret, frame = cap.read()
-            
-            if not ret or frame is None:
-                print("❌ Failed to read frame from stream")
-                break
-            
-            frame_count += 1
+        while time.time() < deadline and not stop_event.is_set():
+            if not frame_ready.wait(timeout=0.1):
+                # Keep the window responsive while waiting for frames
+                if cv2.waitKey(1) & 0xFF == quit_key:
+                    break
+                continue
+            frame_ready.clear()
+            frame = slot["frame"]
+            if y_plane:
+                frame = frame[:height]
             
-            # Display the frame
-            cv2.imshow("RTSP Stream Test", frame)
+            displayed_count += 1
             
-            # Calculate and display current FPS
-            elapsed_time = time.time() - start_time
-            current_fps = frame_count / elapsed_time if elapsed_time > 0 else 0
+            # Calculate and display current FPS (re-rendered only when due)
+            if overlay.needs_refresh():
+                overlay.update((f"FPS: {stats['fps']:.1f}",))
             
             # Add FPS text to frame
-            cv2.putText(frame, f"FPS: {current_fps:.1f}", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            cv2.imshow("RTSP Stream Test", frame)
+            overlay.draw(frame)
+            imshow("RTSP Stream Test", frame)
             
             # Check for 'q' key to quit
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            if cv2.waitKey(1) & 0xFF == quit_key:
                 break
+            
+            # Done with this frame's buffer: the capture thread may reuse it
+            frame_wanted.set()
                 
     except KeyboardInterrupt:
-        print("\n🛑 Interrupted by user")
+        console.warning("\n🛑 Interrupted by user")
     
     finally:
-        cap.release()
+        stop_event.set()
+        grabber.join(timeout=2.0)
+        # A capture thread stuck in grab() on a hung stream still uses cap
+        if not grabber.is_alive():
+            cap.release()
         cv2.destroyAllWindows()
     
+    if stats["failed"]:
+        console.warning("❌ Failed to read frame from stream")
+    # Loop messages come out before the summary
+    flush_console()
+    frame_count = stats["grabbed"]
+    
     # Calculate final statistics
     total_time = time.time() - start_time
     avg_fps = frame_count / total_time if total_time > 0 else 0
     
     print(f"\n📊 Test Results:")
     print(f"   Frames captured: {frame_count}")
+    print(f"   Frames displayed: {displayed_count}")
     print(f"   Time elapsed: {total_time:.1f} seconds")
     print(f"   Average FPS: {avg_fps:.1f}")
     
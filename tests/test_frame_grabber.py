@@ -0,0 +1,76 @@
+"""
+Frame Grabber Tests
+Start/stop behaviour of the background frame grabber against a stub stream.
+
+Author: Academic Research Team
+"""
+
+import os
+import sys
+import time
+import unittest
+import importlib.util
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# rtsp_manager needs OpenCV and NumPy
+DEPENDENCIES_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("cv2", "numpy"))
+
+if DEPENDENCIES_AVAILABLE:
+    import numpy as np
+    from rtsp_detection.rtsp_manager import FrameGrabber, RTSPConfig
+
+class _StubManager:
+    """Stands in for a connected RTSPManager: delivers a number of frames, then loses the stream."""
+
+    def __init__(self, frames=None, frame_interval=0.001):
+        self.config = RTSPConfig(url="rtsp://stub")
+        self.is_connected = True
+        self._frames_left = frames
+        self._frame_interval = frame_interval
+
+    def grab_frame(self):
+        return self.is_connected
+
+    def read_frame(self, drain=None):
+        if self._frames_left is not None:
+            if self._frames_left == 0:
+                self.is_connected = False
+                return False, None
+            self._frames_left -= 1
+        time.sleep(self._frame_interval)
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+@unittest.skipUnless(DEPENDENCIES_AVAILABLE, "requires OpenCV and NumPy")
+class FrameGrabberTest(unittest.TestCase):
+
+    def test_start_and_stop(self):
+        grabber = FrameGrabber(_StubManager())
+        grabber.start()
+
+        success, frame, frame_id = grabber.read(timeout=1.0)
+        self.assertTrue(success)
+        self.assertEqual(frame.shape, (4, 4, 3))
+        self.assertGreater(frame_id, 0)
+
+        grabber.stop(timeout=1.0)
+        self.assertFalse(grabber.is_alive())
+        # Stopping a finished grabber again is harmless
+        grabber.stop(timeout=1.0)
+
+    def test_stream_lost(self):
+        grabber = FrameGrabber(_StubManager(frames=3))
+        grabber.start()
+        grabber.join(timeout=1.0)
+        self.assertFalse(grabber.is_alive())
+
+        # The newest frame is still handed out once, then read() reports no new frame
+        success, _, frame_id = grabber.read(timeout=0.1)
+        self.assertTrue(success)
+        self.assertEqual(frame_id, 3)
+        success, frame, _ = grabber.read(last_frame_id=frame_id, timeout=0.1)
+        self.assertFalse(success)
+        self.assertIsNone(frame)
+
+if __name__ == "__main__":
+    unittest.main()